@@ -1,26 +1,66 @@
 from __future__ import annotations
 
-import csv
+import atexit
+import heapq
 import json
+import os
 import re
-from dataclasses import dataclass
+import time
+from concurrent.futures import ProcessPoolExecutor
+from collections import OrderedDict
+from dataclasses import dataclass, field
 from datetime import UTC, datetime, timedelta
+from functools import lru_cache
+from itertools import repeat
+from operator import itemgetter
 from pathlib import Path
-from typing import Any
+from typing import Any, NamedTuple
+
+import numpy as np
 
 from autostock.config import AppConfig
 from autostock.ib_client import HistoricalBar, IBClient
-from autostock.strategy import Signal, evaluate_combined_signal_at
+from autostock.strategy import SIGNAL_BUY, SIGNAL_SELL, evaluate_combined_signal_series
 
 MAX_BARS_PER_HISTORY_REQUEST = 10_000
 DEFAULT_BACKTEST_CACHE_TTL_HOURS = 24.0
 BACKTEST_CACHE_DIR = Path("data") / "cache" / "backtest"
 BACKTEST_PROGRESS_STEP_EVENTS = 50_000
+# Parsed cache files keyed by path, reused while the file's mtime and size are unchanged (LRU-capped).
+_CACHED_BARS_MEMO: OrderedDict[Path, tuple[tuple[int, int], tuple[HistoricalBar, ...]]] = OrderedDict()
+_CACHED_BARS_MEMO_MAX = 64
+
+
+_LOG_LEVELS = {"DEBUG": 10, "INFO": 20, "WARN": 30, "WARNING": 30, "ERROR": 40}
+_min_log_level = _LOG_LEVELS.get(os.environ.get("AUTOSTOCK_LOG_LEVEL", "INFO").upper(), 20)
+_log_second = -1
+_log_second_text = ""
+
+
+def _log_timestamp() -> str:
+    global _log_second, _log_second_text
+    second, millis = divmod(time.time_ns() // 1_000_000, 1000)
+    if second != _log_second:
+        _log_second = second
+        _log_second_text = time.strftime("%Y-%m-%d %H:%M:%S", time.gmtime(second))
+    return f"{_log_second_text}.{millis:03d}"
+
+
+def _configure_log_level(config_level: str) -> None:
+    # AUTOSTOCK_LOG_LEVEL wins over config.log_level so one run can be made quieter or louder.
+    global _min_log_level
+    level = os.environ.get("AUTOSTOCK_LOG_LEVEL") or config_level or "INFO"
+    _min_log_level = _LOG_LEVELS.get(level.upper(), 20)
+
+
+def _log_enabled(level: str) -> bool:
+    return _LOG_LEVELS.get(level, 20) >= _min_log_level
 
 
 def _log(message: str, level: str = "INFO") -> None:
-    ts = datetime.now(UTC).strftime("%Y-%m-%d %H:%M:%S.%f")[:-3]
-    print(f"[{level}] [{ts}] {message}")
+    if _LOG_LEVELS.get(level, 20) < _min_log_level:
+        return
+    print(f"[{level}] [{_log_timestamp()}] {message}")
 
 
 def _normalize_mode(mode: str | None) -> str:
@@ -30,30 +70,36 @@ def _normalize_mode(mode: str | None) -> str:
     raise ValueError(f"Unsupported backtest mode: {mode}")
 
 
+_DATE_FALLBACK_FORMATS = ("%Y%m%d %H:%M:%S", "%Y-%m-%d %H:%M:%S", "%Y%m%d", "%Y-%m-%d")
+
+
+@lru_cache(maxsize=1 << 17)
+def _parse_bar_datetime(value: str) -> datetime | None:
+    # fromisoformat covers IB's date and datetime strings; strptime is only a fallback.
+    text = value.strip()
+    if not text:
+        return None
+    try:
+        return datetime.fromisoformat(text)
+    except ValueError:
+        pass
+    for fmt in _DATE_FALLBACK_FORMATS:
+        try:
+            return datetime.strptime(text, fmt)
+        except ValueError:
+            continue
+    return None
+
+
 def _date_sort_key(value: Any) -> tuple[int, datetime, str]:
     text = str(value)
-    if isinstance(value, datetime):
-        dt = value
-    else:
-        dt = None
-        for parser in (
-            datetime.fromisoformat,
-            lambda x: datetime.strptime(x, "%Y%m%d"),
-            lambda x: datetime.strptime(x, "%Y-%m-%d"),
-            lambda x: datetime.strptime(x, "%Y-%m-%d %H:%M:%S"),
-        ):
-            try:
-                dt = parser(text)
-                break
-            except ValueError:
-                continue
+    dt = value if isinstance(value, datetime) else _parse_bar_datetime(text)
     if dt is None:
         return (1, datetime(1970, 1, 1), text)
     return (0, dt, text)
 
 
-@dataclass(slots=True)
-class BacktestTrade:
+class BacktestTrade(NamedTuple):
     symbol: str
     entry_time: str
     exit_time: str
@@ -75,7 +121,86 @@ class BacktestResult:
     pnl: float
     return_pct: float
     max_drawdown_pct: float
-    trades_detail: list[BacktestTrade]
+    trades_detail: tuple[BacktestTrade, ...]
+
+
+_EXIT_STRATEGY_SELL = 0
+_EXIT_STOP_LOSS = 1
+_EXIT_FORCED_END = 2
+_EXIT_REASONS = ("STRATEGY_SELL", "STOP_LOSS", "FORCED_EXIT_END")
+
+
+@dataclass(slots=True)
+class BarColumns:
+    dates: list[str]
+    closes: np.ndarray
+
+    @classmethod
+    def from_bars(cls, bars: list[HistoricalBar]) -> BarColumns:
+        return cls(
+            dates=[bar.date for bar in bars],
+            closes=np.fromiter((bar.close for bar in bars), dtype=np.float64, count=len(bars)),
+        )
+
+    def __len__(self) -> int:
+        return len(self.dates)
+
+
+@dataclass(slots=True)
+class _TradeColumns:
+    entry_index: list[int] = field(default_factory=list)
+    exit_index: list[int] = field(default_factory=list)
+    entry_price: list[float] = field(default_factory=list)
+    exit_price: list[float] = field(default_factory=list)
+    shares: list[int] = field(default_factory=list)
+    pnl: list[float] = field(default_factory=list)
+    exit_code: list[int] = field(default_factory=list)
+
+    def append(
+        self,
+        entry_index: int,
+        exit_index: int,
+        entry_price: float,
+        exit_price: float,
+        shares: int,
+        pnl: float,
+        exit_code: int,
+    ) -> None:
+        self.entry_index.append(entry_index)
+        self.exit_index.append(exit_index)
+        self.entry_price.append(entry_price)
+        self.exit_price.append(exit_price)
+        self.shares.append(shares)
+        self.pnl.append(pnl)
+        self.exit_code.append(exit_code)
+
+    def win_loss_counts(self) -> tuple[int, int]:
+        wins = int(np.count_nonzero(np.asarray(self.pnl, dtype=np.float64) >= 0))
+        return wins, len(self.pnl) - wins
+
+    def to_trades(self, symbol: str, dates: list[str]) -> tuple[BacktestTrade, ...]:
+        return tuple(
+            BacktestTrade(
+                symbol=symbol,
+                entry_time=dates[entry_i],
+                exit_time=dates[exit_i],
+                entry_price=entry,
+                exit_price=exit_,
+                shares=shares,
+                pnl=pnl,
+                return_pct=(exit_ - entry) / entry if entry > 0 else 0.0,
+                exit_reason=_EXIT_REASONS[code],
+            )
+            for entry_i, exit_i, entry, exit_, shares, pnl, code in zip(
+                self.entry_index,
+                self.exit_index,
+                self.entry_price,
+                self.exit_price,
+                self.shares,
+                self.pnl,
+                self.exit_code,
+            )
+        )
 
 
 @dataclass(slots=True)
@@ -87,19 +212,31 @@ class BacktestSummary:
     avg_max_drawdown_pct: float
 
 
-def _max_drawdown(equity_curve: list[float]) -> float:
-    if not equity_curve:
-        return 0.0
-    peak = equity_curve[0]
-    max_dd = 0.0
-    for eq in equity_curve:
-        if eq > peak:
-            peak = eq
-        if peak > 0:
-            dd = (peak - eq) / peak
-            if dd > max_dd:
-                max_dd = dd
-    return max_dd
+@dataclass(slots=True)
+class _DrawdownTracker:
+    # Drawdown from a peak is deepest at the lowest point before the next peak, so only
+    # the running peak and that trough are kept instead of the whole equity curve.
+    peak: float
+    trough: float
+    max_drawdown: float = 0.0
+
+    def push(self, equity: float) -> None:
+        if equity > self.peak:
+            self._close_peak()
+            self.peak = equity
+            self.trough = equity
+        elif equity < self.trough:
+            self.trough = equity
+
+    def result(self) -> float:
+        self._close_peak()
+        return self.max_drawdown
+
+    def _close_peak(self) -> None:
+        if self.trough < self.peak and self.peak > 0:
+            drawdown = (self.peak - self.trough) / self.peak
+            if drawdown > self.max_drawdown:
+                self.max_drawdown = drawdown
 
 
 def _slippage_multiplier(side: str, slippage_bps: float) -> float:
@@ -130,27 +267,55 @@ def _cache_fresh(path: Path, ttl_hours: float) -> bool:
 def _load_cached_bars(path: Path) -> list[HistoricalBar]:
     try:
         raw = json.loads(path.read_text(encoding="utf-8"))
-        bars_raw = raw.get("bars", [])
+        columns = raw.get("columns")
         out: list[HistoricalBar] = []
-        for row in bars_raw:
-            if not isinstance(row, dict):
-                continue
-            out.append(
-                HistoricalBar(
-                    date=str(row.get("date", "")),
-                    open=float(row.get("open", 0.0)),
-                    high=float(row.get("high", 0.0)),
-                    low=float(row.get("low", 0.0)),
-                    close=float(row.get("close", 0.0)),
-                    volume=float(row.get("volume", 0.0)),
+        if isinstance(columns, dict):
+            out = [
+                HistoricalBar(date=str(d), open=float(o), high=float(h), low=float(lo), close=float(c), volume=float(v))
+                for d, o, h, lo, c, v in zip(
+                    columns["date"], columns["open"], columns["high"], columns["low"], columns["close"], columns["volume"]
+                )
+            ]
+        else:
+            # Row-per-bar layout written by older versions.
+            for row in raw.get("bars", []):
+                if not isinstance(row, dict):
+                    continue
+                out.append(
+                    HistoricalBar(
+                        date=str(row.get("date", "")),
+                        open=float(row.get("open", 0.0)),
+                        high=float(row.get("high", 0.0)),
+                        low=float(row.get("low", 0.0)),
+                        close=float(row.get("close", 0.0)),
+                        volume=float(row.get("volume", 0.0)),
+                    )
                 )
-            )
         out.sort(key=lambda r: _date_sort_key(r.date))
         return out
     except Exception:  # noqa: BLE001
         return []
 
 
+def _load_cached_bars_memo(path: Path) -> list[HistoricalBar]:
+    try:
+        stat = path.stat()
+    except OSError:
+        return []
+    stamp = (stat.st_mtime_ns, stat.st_size)
+    hit = _CACHED_BARS_MEMO.get(path)
+    if hit is not None and hit[0] == stamp:
+        _CACHED_BARS_MEMO.move_to_end(path)
+        return list(hit[1])
+    bars = _load_cached_bars(path)
+    if bars:
+        _CACHED_BARS_MEMO[path] = (stamp, tuple(bars))
+        _CACHED_BARS_MEMO.move_to_end(path)
+        while len(_CACHED_BARS_MEMO) > _CACHED_BARS_MEMO_MAX:
+            _CACHED_BARS_MEMO.popitem(last=False)
+    return bars
+
+
 def _save_cached_bars(path: Path, symbol: str, duration: str, bar_size: str, bars: list[HistoricalBar]) -> None:
     path.parent.mkdir(parents=True, exist_ok=True)
     payload = {
@@ -158,17 +323,15 @@ def _save_cached_bars(path: Path, symbol: str, duration: str, bar_size: str, bar
         "duration": duration,
         "bar_size": bar_size,
         "saved_at_utc": datetime.now(UTC).isoformat(),
-        "bars": [
-            {
-                "date": b.date,
-                "open": b.open,
-                "high": b.high,
-                "low": b.low,
-                "close": b.close,
-                "volume": b.volume,
-            }
-            for b in bars
-        ],
+        # One list per field keeps the file compact and avoids a dict per bar on load.
+        "columns": {
+            "date": [b.date for b in bars],
+            "open": [b.open for b in bars],
+            "high": [b.high for b in bars],
+            "low": [b.low for b in bars],
+            "close": [b.close for b in bars],
+            "volume": [b.volume for b in bars],
+        },
     }
     path.write_text(json.dumps(payload, ensure_ascii=True), encoding="utf-8")
 
@@ -227,24 +390,6 @@ def _seconds_to_duration(seconds: int) -> str:
     return f"{(sec + 86399) // 86400} D"
 
 
-def _parse_bar_datetime(value: str) -> datetime | None:
-    text = str(value).strip()
-    if not text:
-        return None
-    for parser in (
-        datetime.fromisoformat,
-        lambda x: datetime.strptime(x, "%Y%m%d %H:%M:%S"),
-        lambda x: datetime.strptime(x, "%Y-%m-%d %H:%M:%S"),
-        lambda x: datetime.strptime(x, "%Y%m%d"),
-        lambda x: datetime.strptime(x, "%Y-%m-%d"),
-    ):
-        try:
-            return parser(text)
-        except ValueError:
-            continue
-    return None
-
-
 def _chunked_historical_bars(
     broker: IBClient,
     symbol: str,
@@ -293,7 +438,7 @@ def fetch_historical_bars_with_auto_split(
 ) -> list[HistoricalBar]:
     cache_path = _cache_file(cache_dir, symbol, duration, bar_size)
     if not refresh_cache and cache_ttl_hours > 0 and _cache_fresh(cache_path, cache_ttl_hours):
-        cached = _load_cached_bars(cache_path)
+        cached = _load_cached_bars_memo(cache_path)
         if cached:
             _log(
                 f"{symbol}: backtest cache hit bars={len(cached)} path={cache_path}",
@@ -333,32 +478,220 @@ def fetch_historical_bars_with_auto_split(
     return bars
 
 
-def run_backtest_for_symbol(
-    config: AppConfig,
+def _load_symbol_bars(
     broker: IBClient,
     symbol: str,
-    initial_capital: float,
-    duration: str | None = None,
-    bar_size: str | None = None,
+    duration: str,
+    bar_size: str,
     cache_ttl_hours: float = DEFAULT_BACKTEST_CACHE_TTL_HOURS,
     refresh_cache: bool = False,
-) -> BacktestResult:
-    use_duration = duration or config.strategy.duration
-    use_bar_size = bar_size or config.strategy.bar_size
-    _log(f"{symbol}: fetching bars (duration={use_duration}, bar_size={use_bar_size})")
+) -> list[HistoricalBar]:
+    _log(f"{symbol}: fetching bars (duration={duration}, bar_size={bar_size})")
     bars = fetch_historical_bars_with_auto_split(
         broker=broker,
         symbol=symbol,
-        duration=use_duration,
-        bar_size=use_bar_size,
+        duration=duration,
+        bar_size=bar_size,
         cache_ttl_hours=cache_ttl_hours,
         refresh_cache=refresh_cache,
     )
-    closes = [bar.close for bar in bars]
+    _log_bars_loaded(symbol, bars)
+    return bars
+
+
+def _log_bars_loaded(symbol: str, bars: list[HistoricalBar]) -> None:
     if bars:
         _log(f"{symbol}: bars_loaded={len(bars)}, first={bars[0].date}, last={bars[-1].date}")
     else:
         _log(f"{symbol}: bars_loaded=0")
+
+
+def _prefetch_direct_history(
+    broker: IBClient,
+    symbols: list[str],
+    scenarios: list[tuple[str, str]],
+    fetch_concurrency: int,
+    cache_ttl_hours: float,
+    refresh_cache: bool,
+    cache_dir: Path = BACKTEST_CACHE_DIR,
+) -> dict[tuple[str, str, str], list[HistoricalBar]]:
+    fetch_bulk = getattr(broker, "get_historical_bars_bulk", None)
+    if fetch_bulk is None or fetch_concurrency <= 1:
+        return {}
+    use_cache = not refresh_cache and cache_ttl_hours > 0
+    pending = [
+        (symbol, duration, bar_size)
+        for duration, bar_size in dict.fromkeys(scenarios)
+        if _estimated_bars(duration, bar_size) <= MAX_BARS_PER_HISTORY_REQUEST
+        for symbol in dict.fromkeys(symbols)
+        if not (use_cache and _cache_fresh(_cache_file(cache_dir, symbol, duration, bar_size), cache_ttl_hours))
+    ]
+    if len(pending) < 2:
+        return {}
+    _log(f"fetching {len(pending)} histories concurrently (max_concurrency={fetch_concurrency})")
+    try:
+        fetched = fetch_bulk(pending, max_concurrency=fetch_concurrency)
+    except Exception as exc:  # noqa: BLE001
+        _log(f"concurrent history request failed ({exc}); fetching symbols one by one", level="WARN")
+        return {}
+    out: dict[tuple[str, str, str], list[HistoricalBar]] = {}
+    for request in pending:
+        bars = fetched.get(request) or []
+        if not bars:
+            continue
+        symbol, duration, bar_size = request
+        _save_cached_bars(_cache_file(cache_dir, symbol, duration, bar_size), symbol, duration, bar_size, bars)
+        out[request] = bars
+    return out
+
+
+def prefetch_backtest_history(
+    config: AppConfig,
+    broker: IBClient,
+    symbols: list[str],
+    scenarios: list[tuple[str, str]],
+    cache_ttl_hours: float = DEFAULT_BACKTEST_CACHE_TTL_HOURS,
+    refresh_cache: bool = False,
+) -> dict[tuple[str, str, str], list[HistoricalBar]]:
+    return _prefetch_direct_history(
+        broker,
+        symbols,
+        scenarios,
+        config.backtest.fetch_concurrency,
+        cache_ttl_hours,
+        refresh_cache,
+    )
+
+
+def _load_bars_for_symbols(
+    config: AppConfig,
+    broker: IBClient,
+    symbols: list[str],
+    duration: str,
+    bar_size: str,
+    cache_ttl_hours: float = DEFAULT_BACKTEST_CACHE_TTL_HOURS,
+    refresh_cache: bool = False,
+    prefetched: dict[tuple[str, str, str], list[HistoricalBar]] | None = None,
+) -> list[list[HistoricalBar]]:
+    # Cache misses that fit in one request are fetched together; everything else
+    # (cache hits, chunked histories, failed requests) goes through the per-symbol path.
+    if prefetched is None:
+        prefetched = _prefetch_direct_history(
+            broker,
+            symbols,
+            [(duration, bar_size)],
+            config.backtest.fetch_concurrency,
+            cache_ttl_hours,
+            refresh_cache,
+        )
+    out: list[list[HistoricalBar]] = []
+    for symbol in symbols:
+        bars = prefetched.get((symbol, duration, bar_size))
+        if bars is None:
+            bars = _load_symbol_bars(
+                broker, symbol, duration, bar_size, cache_ttl_hours=cache_ttl_hours, refresh_cache=refresh_cache
+            )
+        else:
+            _log_bars_loaded(symbol, bars)
+        out.append(bars)
+    return out
+
+
+def run_backtest_for_symbol(
+    config: AppConfig,
+    broker: IBClient,
+    symbol: str,
+    initial_capital: float,
+    duration: str | None = None,
+    bar_size: str | None = None,
+    cache_ttl_hours: float = DEFAULT_BACKTEST_CACHE_TTL_HOURS,
+    refresh_cache: bool = False,
+) -> BacktestResult:
+    bars = _load_symbol_bars(
+        broker,
+        symbol,
+        duration or config.strategy.duration,
+        bar_size or config.strategy.bar_size,
+        cache_ttl_hours=cache_ttl_hours,
+        refresh_cache=refresh_cache,
+    )
+    return _simulate_symbol(config, symbol, BarColumns.from_bars(bars), initial_capital)
+
+
+def _run_backtest_per_symbol(
+    config: AppConfig,
+    broker: IBClient,
+    initial_capital: float,
+    duration: str,
+    bar_size: str,
+    symbols: list[str],
+    cache_ttl_hours: float = DEFAULT_BACKTEST_CACHE_TTL_HOURS,
+    refresh_cache: bool = False,
+    prefetched: dict[tuple[str, str, str], list[HistoricalBar]] | None = None,
+) -> list[BacktestResult]:
+    # IBClient cannot cross process boundaries, so fetch in the parent and only fan out the simulation.
+    columns_list = [
+        BarColumns.from_bars(bars)
+        for bars in _load_bars_for_symbols(
+            config,
+            broker,
+            symbols,
+            duration,
+            bar_size,
+            cache_ttl_hours=cache_ttl_hours,
+            refresh_cache=refresh_cache,
+            prefetched=prefetched,
+        )
+    ]
+    requested = config.backtest.workers or os.cpu_count() or 1
+    workers = min(max(1, requested), len(symbols))
+    if workers <= 1:
+        return [
+            _simulate_symbol(config, symbol, columns, initial_capital) for symbol, columns in zip(symbols, columns_list)
+        ]
+    _log(f"per-symbol simulation using {workers} worker processes")
+    pool = _simulation_pool(workers, config.log_level)
+    return list(pool.map(_simulate_symbol, repeat(config), symbols, columns_list, repeat(initial_capital)))
+
+
+# Worker processes are reused across run_backtest calls (both `backtest` bar sizes and
+# every backtest-grid run) instead of being spawned per call.
+_pool: ProcessPoolExecutor | None = None
+_pool_key: tuple[int, str] | None = None
+
+
+def _simulation_pool(workers: int, log_level: str) -> ProcessPoolExecutor:
+    global _pool, _pool_key
+    key = (workers, log_level)
+    if _pool is None or _pool_key != key:
+        shutdown_simulation_pool()
+        _pool = ProcessPoolExecutor(max_workers=workers, initializer=_configure_log_level, initargs=(log_level,))
+        _pool_key = key
+    return _pool
+
+
+def shutdown_simulation_pool() -> None:
+    global _pool, _pool_key
+    if _pool is not None:
+        _pool.shutdown()
+    _pool = None
+    _pool_key = None
+
+
+atexit.register(shutdown_simulation_pool)
+
+
+def _signal_codes(closes: np.ndarray, config: AppConfig) -> list[int]:
+    return evaluate_combined_signal_series(closes, config.strategy, config.strategy_combo).tolist()
+
+
+def _simulate_symbol(
+    config: AppConfig,
+    symbol: str,
+    columns: BarColumns,
+    initial_capital: float,
+) -> BacktestResult:
+    closes = columns.closes
     if len(closes) < 5:
         _log(f"{symbol}: skipped (insufficient bars={len(closes)})")
         return BacktestResult(
@@ -370,91 +703,92 @@ def run_backtest_for_symbol(
             pnl=0.0,
             return_pct=0.0,
             max_drawdown_pct=0.0,
-            trades_detail=[],
+            trades_detail=(),
         )
 
-    aligned_prices = closes
-    aligned_bars = bars
+    # Scalar reads in the bar loop are cheaper on a list than on ndarray elements.
+    aligned_prices = closes.tolist()
+    time_labels = columns.dates
 
     in_position = False
     entry = 0.0
-    entry_time = ""
+    stop_price = 0.0
+    entry_index = 0
     shares = 0
     cash = initial_capital
     realized_pnl = 0.0
-    trades_detail: list[BacktestTrade] = []
-    wins = 0
-    losses = 0
-    equity_curve = [initial_capital]
+    trade_columns = _TradeColumns()
+    drawdown = _DrawdownTracker(peak=initial_capital, trough=initial_capital)
     consecutive_losses = 0
     blocked_by_consecutive = 0
     blocked_by_min_notional = 0
+    signal_codes = _signal_codes(closes, config)
+    log_trades = _log_enabled("INFO")
+    buy_multiplier = _slippage_multiplier("BUY", config.backtest.slippage_bps)
+    sell_multiplier = _slippage_multiplier("SELL", config.backtest.slippage_bps)
+    stop_multiplier = 1 - config.risk.stop_loss_pct
+    max_position_pct = config.risk.max_position_pct
+    max_consecutive_losses = config.risk.max_consecutive_losses
+    commission = config.backtest.commission_per_order
+    min_order_notional = config.backtest.min_order_notional
 
     for i in range(1, len(aligned_prices)):
         price = aligned_prices[i]
-        time_label = aligned_bars[i].date
-        signal_, _detail = evaluate_combined_signal_at(aligned_prices, i, config.strategy, config.strategy_combo)
-        stop_loss = in_position and price <= entry * (1 - config.risk.stop_loss_pct)
-
-        if signal_ == Signal.BUY and not in_position:
-            if consecutive_losses >= config.risk.max_consecutive_losses:
+        time_label = time_labels[i]
+        code = signal_codes[i]
+
+        if in_position:
+            stop_loss = price <= stop_price
+            if stop_loss or code == SIGNAL_SELL:
+                exit_code = _EXIT_STOP_LOSS if stop_loss else _EXIT_STRATEGY_SELL
+                sell_fill = price * sell_multiplier
+                cash += shares * sell_fill
+                cash -= commission
+                trade_pnl = (sell_fill - entry) * shares - (2.0 * commission)
+                realized_pnl += trade_pnl
+                trade_columns.append(entry_index, i, entry, sell_fill, shares, trade_pnl, exit_code)
+                if trade_pnl >= 0:
+                    consecutive_losses = 0
+                else:
+                    consecutive_losses += 1
+                if log_trades:
+                    _log(
+                        f"{symbol}: {_EXIT_REASONS[exit_code]} {shares} @ {sell_fill:.2f} on {time_label} "
+                        f"(trade_pnl={trade_pnl:.2f}, cash={cash:.2f}, consecutive_losses={consecutive_losses})"
+                    )
+                shares = 0
+                in_position = False
+                entry = 0.0
+                stop_price = 0.0
+                drawdown.push(cash)
+        elif code == SIGNAL_BUY:
+            if consecutive_losses >= max_consecutive_losses:
                 blocked_by_consecutive += 1
                 continue
-            budget = cash * config.risk.max_position_pct
-            buy_fill = price * _slippage_multiplier("BUY", config.backtest.slippage_bps)
+            budget = cash * max_position_pct
+            buy_fill = price * buy_multiplier
             order_shares = int(budget // buy_fill)
             if order_shares > 0:
                 notional = order_shares * buy_fill
-                if notional < config.backtest.min_order_notional:
+                if notional < min_order_notional:
                     blocked_by_min_notional += 1
                     continue
                 shares = order_shares
                 cash -= notional
-                cash -= config.backtest.commission_per_order
+                cash -= commission
                 entry = buy_fill
-                entry_time = time_label
+                stop_price = entry * stop_multiplier
+                entry_index = i
                 in_position = True
-                _log(
-                    f"{symbol}: BUY {shares} @ {entry:.2f} on {entry_time} "
-                    f"(cash={cash:.2f}, budget={budget:.2f})"
-                )
-        elif in_position and (signal_ == Signal.SELL or stop_loss):
-            exit_reason = "STOP_LOSS" if stop_loss else "STRATEGY_SELL"
-            sell_fill = price * _slippage_multiplier("SELL", config.backtest.slippage_bps)
-            cash += shares * sell_fill
-            cash -= config.backtest.commission_per_order
-            trade_pnl = (sell_fill - entry) * shares - (2.0 * config.backtest.commission_per_order)
-            realized_pnl += trade_pnl
-            return_pct = (sell_fill - entry) / entry if entry > 0 else 0.0
-            trades_detail.append(
-                BacktestTrade(
-                    symbol=symbol,
-                    entry_time=entry_time,
-                    exit_time=time_label,
-                    entry_price=entry,
-                    exit_price=sell_fill,
-                    shares=shares,
-                    pnl=trade_pnl,
-                    return_pct=return_pct,
-                    exit_reason=exit_reason,
-                )
-            )
-            if trade_pnl >= 0:
-                wins += 1
-                consecutive_losses = 0
-            else:
-                losses += 1
-                consecutive_losses += 1
-            _log(
-                f"{symbol}: {exit_reason} {shares} @ {sell_fill:.2f} on {time_label} "
-                f"(trade_pnl={trade_pnl:.2f}, cash={cash:.2f}, consecutive_losses={consecutive_losses})"
-            )
-            shares = 0
-            in_position = False
-            entry = 0.0
-
-        current_equity = cash + (shares * price if in_position else 0.0)
-        equity_curve.append(current_equity)
+                if log_trades:
+                    _log(
+                        f"{symbol}: BUY {shares} @ {entry:.2f} on {time_label} "
+                        f"(cash={cash:.2f}, budget={budget:.2f})"
+                    )
+
+        # Flat equity is just cash, which only moves on exits (pushed above).
+        if in_position:
+            drawdown.push(cash + shares * price)
         if i % BACKTEST_PROGRESS_STEP_EVENTS == 0:
             _log(
                 f"{symbol}: progress {i}/{len(aligned_prices)-1} ({i*100.0/max(1, len(aligned_prices)-1):.1f}%)",
@@ -463,41 +797,28 @@ def run_backtest_for_symbol(
 
     if in_position:
         final_price = aligned_prices[-1]
-        final_time = aligned_bars[-1].date
-        sell_fill = final_price * _slippage_multiplier("SELL", config.backtest.slippage_bps)
+        final_time = time_labels[-1]
+        sell_fill = final_price * sell_multiplier
         cash += shares * sell_fill
-        cash -= config.backtest.commission_per_order
-        trade_pnl = (sell_fill - entry) * shares - (2.0 * config.backtest.commission_per_order)
+        cash -= commission
+        trade_pnl = (sell_fill - entry) * shares - (2.0 * commission)
         realized_pnl += trade_pnl
-        return_pct = (sell_fill - entry) / entry if entry > 0 else 0.0
-        trades_detail.append(
-            BacktestTrade(
-                symbol=symbol,
-                entry_time=entry_time,
-                exit_time=final_time,
-                entry_price=entry,
-                exit_price=sell_fill,
-                shares=shares,
-                pnl=trade_pnl,
-                return_pct=return_pct,
-                exit_reason="FORCED_EXIT_END",
+        trade_columns.append(entry_index, len(aligned_prices) - 1, entry, sell_fill, shares, trade_pnl, _EXIT_FORCED_END)
+        drawdown.push(cash)
+        if log_trades:
+            _log(
+                f"{symbol}: FORCED_EXIT_END {shares} @ {sell_fill:.2f} on {final_time} "
+                f"(trade_pnl={trade_pnl:.2f}, cash={cash:.2f})"
             )
-        )
-        if trade_pnl >= 0:
-            wins += 1
-        else:
-            losses += 1
-        equity_curve.append(cash)
-        _log(
-            f"{symbol}: FORCED_EXIT_END {shares} @ {sell_fill:.2f} on {final_time} "
-            f"(trade_pnl={trade_pnl:.2f}, cash={cash:.2f})"
-        )
 
+    trades_detail = trade_columns.to_trades(symbol, time_labels)
     trades = len(trades_detail)
+    wins, losses = trade_columns.win_loss_counts()
     return_pct = ((cash - initial_capital) / initial_capital) if initial_capital > 0 else 0.0
+    max_drawdown_pct = drawdown.result()
     _log(
         f"{symbol}: completed bars={len(closes)}, trades={trades}, wins={wins}, losses={losses}, "
-        f"pnl={realized_pnl:.2f}, return={return_pct*100:.2f}%, maxDD={_max_drawdown(equity_curve)*100:.2f}%, "
+        f"pnl={realized_pnl:.2f}, return={return_pct*100:.2f}%, maxDD={max_drawdown_pct*100:.2f}%, "
         f"blocked_consecutive={blocked_by_consecutive}, blocked_min_notional={blocked_by_min_notional}"
     )
 
@@ -509,11 +830,15 @@ def run_backtest_for_symbol(
         losses=losses,
         pnl=realized_pnl,
         return_pct=return_pct,
-        max_drawdown_pct=_max_drawdown(equity_curve),
+        max_drawdown_pct=max_drawdown_pct,
         trades_detail=trades_detail,
     )
 
 
+_event_time_key = itemgetter(0)
+_event_order_key = itemgetter(0, 1)
+
+
 def _run_backtest_portfolio(
     config: AppConfig,
     broker: IBClient,
@@ -523,152 +848,156 @@ def _run_backtest_portfolio(
     symbols: list[str],
     cache_ttl_hours: float = DEFAULT_BACKTEST_CACHE_TTL_HOURS,
     refresh_cache: bool = False,
+    prefetched: dict[tuple[str, str, str], list[HistoricalBar]] | None = None,
 ) -> list[BacktestResult]:
-    bars_by_symbol: dict[str, list] = {}
-    closes_by_symbol: dict[str, list[float]] = {}
-    latest_price: dict[str, float] = {}
-    for symbol in symbols:
-        _log(f"{symbol}: fetching bars (duration={duration}, bar_size={bar_size})")
-        bars = fetch_historical_bars_with_auto_split(
-            broker=broker,
-            symbol=symbol,
-            duration=duration,
-            bar_size=bar_size,
-            cache_ttl_hours=cache_ttl_hours,
-            refresh_cache=refresh_cache,
-        )
-        closes = [bar.close for bar in bars]
-        bars_by_symbol[symbol] = bars
-        closes_by_symbol[symbol] = closes
+    # Per-symbol state is kept as parallel lists indexed by symbol id.
+    symbol_index = {symbol: k for k, symbol in enumerate(symbols)}
+    count = len(symbols)
+    dates_by_id: list[list[str]] = [[] for _ in range(count)]
+    closes_by_id: list[np.ndarray] = [np.empty(0, dtype=np.float64) for _ in range(count)]
+    prices_by_id: list[list[float]] = [[] for _ in range(count)]
+    latest_price = [0.0] * count
+    loaded = _load_bars_for_symbols(
+        config,
+        broker,
+        symbols,
+        duration,
+        bar_size,
+        cache_ttl_hours=cache_ttl_hours,
+        refresh_cache=refresh_cache,
+        prefetched=prefetched,
+    )
+    for symbol, bars in zip(symbols, loaded):
+        k = symbol_index[symbol]
+        columns = BarColumns.from_bars(bars)
+        dates_by_id[k] = columns.dates
+        closes_by_id[k] = columns.closes
+        prices_by_id[k] = columns.closes.tolist()
         if bars:
-            latest_price[symbol] = closes[0]
-            _log(f"{symbol}: bars_loaded={len(bars)}, first={bars[0].date}, last={bars[-1].date}")
-        else:
-            _log(f"{symbol}: bars_loaded=0")
-
-    states: dict[str, dict[str, Any]] = {}
-    for symbol in symbols:
-        states[symbol] = {
-            "in_position": False,
-            "entry": 0.0,
-            "entry_time": "",
-            "shares": 0,
-            "realized_pnl": 0.0,
-            "trades_detail": [],
-            "wins": 0,
-            "losses": 0,
-            "consecutive_losses": 0,
-            "blocked_consecutive": 0,
-            "blocked_min_notional": 0,
-            "blocked_cash": 0,
-            "blocked_max_open_positions": 0,
-            "equity_curve": [initial_capital],
-        }
+            latest_price[k] = prices_by_id[k][0]
+    # Symbols without enough bars never open a position, so position scans skip them.
+    active_ids = [symbol_index[symbol] for symbol in symbols if len(dates_by_id[symbol_index[symbol]]) >= 5]
+
+    in_position = [False] * count
+    entry = [0.0] * count
+    stop_price = [0.0] * count
+    entry_index = [0] * count
+    shares = [0] * count
+    realized_pnl = [0.0] * count
+    trade_columns = [_TradeColumns() for _ in range(count)]
+    consecutive_losses = [0] * count
+    blocked_consecutive = [0] * count
+    blocked_min_notional = [0] * count
+    blocked_cash = [0] * count
+    blocked_max_open_positions = [0] * count
+    drawdowns = [_DrawdownTracker(peak=initial_capital, trough=initial_capital) for _ in range(count)]
 
     cash = float(initial_capital)
+    open_positions = 0
+    buy_multiplier = _slippage_multiplier("BUY", config.backtest.slippage_bps)
+    sell_multiplier = _slippage_multiplier("SELL", config.backtest.slippage_bps)
+    stop_multiplier = 1 - config.risk.stop_loss_pct
+    max_position_pct = config.risk.max_position_pct
+    max_consecutive_losses = config.risk.max_consecutive_losses
+    commission = config.backtest.commission_per_order
+    min_order_notional = config.backtest.min_order_notional
+    max_open_positions = config.risk.max_open_positions
+    log_trades = _log_enabled("INFO")
 
     def _portfolio_equity() -> float:
         position_value = 0.0
-        for sym in symbols:
-            st = states[sym]
-            if st["in_position"]:
-                position_value += st["shares"] * latest_price.get(sym, 0.0)
+        for k in active_ids:
+            if in_position[k]:
+                position_value += shares[k] * latest_price[k]
         return cash + position_value
 
-    events: list[tuple[tuple[int, datetime, str], str, int]] = []
+    # Each symbol's events are sorted on their own (a linear pass for chronological bars)
+    # and then k-way merged, instead of sorting the whole event stream at once.
+    streams: list[list[tuple[tuple[int, datetime, str], str, int, int]]] = []
+    signal_codes: list[list[int]] = [[] for _ in range(count)]
     for symbol in symbols:
-        bars = bars_by_symbol[symbol]
-        if len(bars) < 5:
-            _log(f"{symbol}: skipped (insufficient bars={len(bars)})")
+        k = symbol_index[symbol]
+        dates = dates_by_id[k]
+        if len(dates) < 5:
+            _log(f"{symbol}: skipped (insufficient bars={len(dates)})")
             continue
-        for i in range(1, len(bars)):
-            events.append((_date_sort_key(bars[i].date), symbol, i))
+        stream = [(_date_sort_key(dates[i]), symbol, i, k) for i in range(1, len(dates))]
+        stream.sort(key=_event_time_key)
+        streams.append(stream)
+        signal_codes[k] = _signal_codes(closes_by_id[k], config)
 
-    events.sort(key=lambda x: (x[0], x[1]))
-    total_events = len(events)
+    total_events = sum(len(stream) for stream in streams)
+    events = heapq.merge(*streams, key=_event_order_key)
     _log(f"portfolio event stream prepared: total_events={total_events}, symbols={len(symbols)}", level="INFO")
 
-    for event_idx, (_sort_key, symbol, i) in enumerate(events, start=1):
-        bars = bars_by_symbol[symbol]
-        closes = closes_by_symbol[symbol]
-        st = states[symbol]
-
-        price = closes[i]
-        time_label = bars[i].date
-        latest_price[symbol] = price
-        signal_, _detail = evaluate_combined_signal_at(closes, i, config.strategy, config.strategy_combo)
-        stop_loss = st["in_position"] and price <= st["entry"] * (1 - config.risk.stop_loss_pct)
-
-        if signal_ == Signal.BUY and not st["in_position"]:
-            if st["consecutive_losses"] >= config.risk.max_consecutive_losses:
-                st["blocked_consecutive"] += 1
+    for event_idx, (_sort_key, symbol, i, k) in enumerate(events, start=1):
+        price = prices_by_id[k][i]
+        time_label = dates_by_id[k][i]
+        latest_price[k] = price
+        code = signal_codes[k][i]
+
+        if in_position[k]:
+            stop_loss = price <= stop_price[k]
+            if stop_loss or code == SIGNAL_SELL:
+                exit_code = _EXIT_STOP_LOSS if stop_loss else _EXIT_STRATEGY_SELL
+                entry_k = entry[k]
+                shares_k = shares[k]
+                sell_fill = price * sell_multiplier
+                cash += shares_k * sell_fill
+                cash -= commission
+                trade_pnl = (sell_fill - entry_k) * shares_k - (2.0 * commission)
+                realized_pnl[k] += trade_pnl
+                trade_columns[k].append(entry_index[k], i, entry_k, sell_fill, shares_k, trade_pnl, exit_code)
+                if trade_pnl >= 0:
+                    consecutive_losses[k] = 0
+                else:
+                    consecutive_losses[k] += 1
+                if log_trades:
+                    _log(
+                        f"{symbol}: {_EXIT_REASONS[exit_code]} {shares_k} @ {sell_fill:.2f} on {time_label} "
+                        f"(trade_pnl={trade_pnl:.2f}, cash={cash:.2f}, consecutive_losses={consecutive_losses[k]})"
+                    )
+                shares[k] = 0
+                in_position[k] = False
+                open_positions -= 1
+                entry[k] = 0.0
+                stop_price[k] = 0.0
+        elif code == SIGNAL_BUY:
+            if consecutive_losses[k] >= max_consecutive_losses:
+                blocked_consecutive[k] += 1
                 continue
-            open_positions = sum(1 for sym in symbols if states[sym]["in_position"])
-            if open_positions >= config.risk.max_open_positions:
-                st["blocked_max_open_positions"] += 1
+            if open_positions >= max_open_positions:
+                blocked_max_open_positions[k] += 1
                 continue
 
-            budget = _portfolio_equity() * config.risk.max_position_pct
-            buy_fill = price * _slippage_multiplier("BUY", config.backtest.slippage_bps)
+            budget = _portfolio_equity() * max_position_pct
+            buy_fill = price * buy_multiplier
             effective_budget = min(budget, cash)
             order_shares = int(effective_budget // buy_fill) if buy_fill > 0 else 0
             if order_shares > 0:
                 notional = order_shares * buy_fill
-                if notional < config.backtest.min_order_notional:
-                    st["blocked_min_notional"] += 1
+                if notional < min_order_notional:
+                    blocked_min_notional[k] += 1
                     continue
-                st["shares"] = order_shares
+                shares[k] = order_shares
                 cash -= notional
-                cash -= config.backtest.commission_per_order
-                st["entry"] = buy_fill
-                st["entry_time"] = time_label
-                st["in_position"] = True
-                _log(
-                    f"{symbol}: BUY {st['shares']} @ {st['entry']:.2f} on {st['entry_time']} "
-                    f"(cash={cash:.2f}, budget={budget:.2f})"
-                )
+                cash -= commission
+                entry[k] = buy_fill
+                stop_price[k] = buy_fill * stop_multiplier
+                entry_index[k] = i
+                in_position[k] = True
+                open_positions += 1
+                if log_trades:
+                    _log(
+                        f"{symbol}: BUY {order_shares} @ {buy_fill:.2f} on {time_label} "
+                        f"(cash={cash:.2f}, budget={budget:.2f})"
+                    )
             else:
-                st["blocked_cash"] += 1
-        elif st["in_position"] and (signal_ == Signal.SELL or stop_loss):
-            exit_reason = "STOP_LOSS" if stop_loss else "STRATEGY_SELL"
-            sell_fill = price * _slippage_multiplier("SELL", config.backtest.slippage_bps)
-            cash += st["shares"] * sell_fill
-            cash -= config.backtest.commission_per_order
-            trade_pnl = (sell_fill - st["entry"]) * st["shares"] - (2.0 * config.backtest.commission_per_order)
-            st["realized_pnl"] += trade_pnl
-            return_pct = (sell_fill - st["entry"]) / st["entry"] if st["entry"] > 0 else 0.0
-            st["trades_detail"].append(
-                BacktestTrade(
-                    symbol=symbol,
-                    entry_time=st["entry_time"],
-                    exit_time=time_label,
-                    entry_price=st["entry"],
-                    exit_price=sell_fill,
-                    shares=st["shares"],
-                    pnl=trade_pnl,
-                    return_pct=return_pct,
-                    exit_reason=exit_reason,
-                )
-            )
-            if trade_pnl >= 0:
-                st["wins"] += 1
-                st["consecutive_losses"] = 0
-            else:
-                st["losses"] += 1
-                st["consecutive_losses"] += 1
-            _log(
-                f"{symbol}: {exit_reason} {st['shares']} @ {sell_fill:.2f} on {time_label} "
-                f"(trade_pnl={trade_pnl:.2f}, cash={cash:.2f}, consecutive_losses={st['consecutive_losses']})"
-            )
-            st["shares"] = 0
-            st["in_position"] = False
-            st["entry"] = 0.0
-            st["entry_time"] = ""
+                blocked_cash[k] += 1
 
-        for sym in symbols:
-            st_sym = states[sym]
-            position_value = st_sym["shares"] * latest_price.get(sym, 0.0) if st_sym["in_position"] else 0.0
-            st_sym["equity_curve"].append(initial_capital + st_sym["realized_pnl"] + position_value)
+        # Other symbols' equity cannot change on this event, so only this symbol gets a new point.
+        position_value = shares[k] * price if in_position[k] else 0.0
+        drawdowns[k].push(initial_capital + realized_pnl[k] + position_value)
 
         if event_idx % BACKTEST_PROGRESS_STEP_EVENTS == 0:
             _log(
@@ -677,74 +1006,66 @@ def _run_backtest_portfolio(
             )
 
     for symbol in symbols:
-        bars = bars_by_symbol[symbol]
-        if not bars:
+        k = symbol_index[symbol]
+        dates = dates_by_id[k]
+        if not dates:
             continue
-        st = states[symbol]
-        if not st["in_position"]:
+        if not in_position[k]:
             continue
-        final_price = closes_by_symbol[symbol][-1]
-        final_time = bars[-1].date
-        latest_price[symbol] = final_price
-        sell_fill = final_price * _slippage_multiplier("SELL", config.backtest.slippage_bps)
-        cash += st["shares"] * sell_fill
-        cash -= config.backtest.commission_per_order
-        trade_pnl = (sell_fill - st["entry"]) * st["shares"] - (2.0 * config.backtest.commission_per_order)
-        st["realized_pnl"] += trade_pnl
-        return_pct = (sell_fill - st["entry"]) / st["entry"] if st["entry"] > 0 else 0.0
-        st["trades_detail"].append(
-            BacktestTrade(
-                symbol=symbol,
-                entry_time=st["entry_time"],
-                exit_time=final_time,
-                entry_price=st["entry"],
-                exit_price=sell_fill,
-                shares=st["shares"],
-                pnl=trade_pnl,
-                return_pct=return_pct,
-                exit_reason="FORCED_EXIT_END",
-            )
-        )
+        final_index = len(dates) - 1
+        final_price = prices_by_id[k][final_index]
+        final_time = dates[final_index]
+        latest_price[k] = final_price
+        entry_k = entry[k]
+        shares_k = shares[k]
+        sell_fill = final_price * sell_multiplier
+        cash += shares_k * sell_fill
+        cash -= commission
+        trade_pnl = (sell_fill - entry_k) * shares_k - (2.0 * commission)
+        realized_pnl[k] += trade_pnl
+        trade_columns[k].append(entry_index[k], final_index, entry_k, sell_fill, shares_k, trade_pnl, _EXIT_FORCED_END)
         if trade_pnl >= 0:
-            st["wins"] += 1
-            st["consecutive_losses"] = 0
+            consecutive_losses[k] = 0
         else:
-            st["losses"] += 1
-            st["consecutive_losses"] += 1
-        _log(
-            f"{symbol}: FORCED_EXIT_END {st['shares']} @ {sell_fill:.2f} on {final_time} "
-            f"(trade_pnl={trade_pnl:.2f}, cash={cash:.2f})"
-        )
-        st["shares"] = 0
-        st["in_position"] = False
-        st["entry"] = 0.0
-        st["entry_time"] = ""
-        st["equity_curve"].append(initial_capital + st["realized_pnl"])
+            consecutive_losses[k] += 1
+        if log_trades:
+            _log(
+                f"{symbol}: FORCED_EXIT_END {shares_k} @ {sell_fill:.2f} on {final_time} "
+                f"(trade_pnl={trade_pnl:.2f}, cash={cash:.2f})"
+            )
+        shares[k] = 0
+        in_position[k] = False
+        entry[k] = 0.0
+        stop_price[k] = 0.0
+        drawdowns[k].push(initial_capital + realized_pnl[k])
 
     results: list[BacktestResult] = []
     for symbol in symbols:
-        st = states[symbol]
-        closes = closes_by_symbol[symbol]
-        trades = len(st["trades_detail"])
-        contribution_return = (st["realized_pnl"] / initial_capital) if initial_capital > 0 else 0.0
+        k = symbol_index[symbol]
+        bars_count = len(closes_by_id[k])
+        trades_detail = trade_columns[k].to_trades(symbol, dates_by_id[k])
+        trades = len(trades_detail)
+        wins, losses = trade_columns[k].win_loss_counts()
+        pnl = realized_pnl[k]
+        contribution_return = (pnl / initial_capital) if initial_capital > 0 else 0.0
         result = BacktestResult(
             symbol=symbol,
-            bars=len(closes),
+            bars=bars_count,
             trades=trades,
-            wins=st["wins"],
-            losses=st["losses"],
-            pnl=st["realized_pnl"],
+            wins=wins,
+            losses=losses,
+            pnl=pnl,
             return_pct=contribution_return,
-            max_drawdown_pct=_max_drawdown(st["equity_curve"]),
-            trades_detail=st["trades_detail"],
+            max_drawdown_pct=drawdowns[k].result(),
+            trades_detail=trades_detail,
         )
         results.append(result)
         _log(
-            f"{symbol}: completed bars={len(closes)}, trades={trades}, wins={st['wins']}, losses={st['losses']}, "
-            f"pnl={st['realized_pnl']:.2f}, return_contribution={contribution_return*100:.2f}%, "
-            f"maxDD={result.max_drawdown_pct*100:.2f}%, blocked_consecutive={st['blocked_consecutive']}, "
-            f"blocked_min_notional={st['blocked_min_notional']}, blocked_cash={st['blocked_cash']}, "
-            f"blocked_max_open_positions={st['blocked_max_open_positions']}"
+            f"{symbol}: completed bars={bars_count}, trades={trades}, wins={wins}, losses={losses}, "
+            f"pnl={pnl:.2f}, return_contribution={contribution_return*100:.2f}%, "
+            f"maxDD={result.max_drawdown_pct*100:.2f}%, blocked_consecutive={blocked_consecutive[k]}, "
+            f"blocked_min_notional={blocked_min_notional[k]}, blocked_cash={blocked_cash[k]}, "
+            f"blocked_max_open_positions={blocked_max_open_positions[k]}"
         )
 
     return results
@@ -760,7 +1081,9 @@ def run_backtest(
     mode: str = "portfolio",
     cache_ttl_hours: float = DEFAULT_BACKTEST_CACHE_TTL_HOURS,
     refresh_cache: bool = False,
+    prefetched: dict[tuple[str, str, str], list[HistoricalBar]] | None = None,
 ) -> list[BacktestResult]:
+    _configure_log_level(config.log_level)
     normalized_mode = _normalize_mode(mode)
     symbol_list = symbols if symbols is not None else config.symbols
     use_duration = duration or config.strategy.duration
@@ -780,21 +1103,20 @@ def run_backtest(
             symbols=symbol_list,
             cache_ttl_hours=cache_ttl_hours,
             refresh_cache=refresh_cache,
+            prefetched=prefetched,
         )
     else:
-        results = [
-            run_backtest_for_symbol(
-                config,
-                broker,
-                symbol,
-                initial_capital,
-                duration=duration,
-                bar_size=bar_size,
-                cache_ttl_hours=cache_ttl_hours,
-                refresh_cache=refresh_cache,
-            )
-            for symbol in symbol_list
-        ]
+        results = _run_backtest_per_symbol(
+            config=config,
+            broker=broker,
+            initial_capital=initial_capital,
+            duration=use_duration,
+            bar_size=use_bar_size,
+            symbols=symbol_list,
+            cache_ttl_hours=cache_ttl_hours,
+            refresh_cache=refresh_cache,
+            prefetched=prefetched,
+        )
     summary = summarize_backtest(results)
     _log(
         f"batch end: symbols={summary.total_symbols}, trades={summary.total_trades}, "
@@ -807,10 +1129,17 @@ def run_backtest(
 def summarize_backtest(results: list[BacktestResult]) -> BacktestSummary:
     if not results:
         return BacktestSummary(0, 0, 0.0, 0.0, 0.0)
-    total_trades = sum(r.trades for r in results)
-    total_pnl = sum(r.pnl for r in results)
-    avg_return = sum(r.return_pct for r in results) / len(results)
-    avg_dd = sum(r.max_drawdown_pct for r in results) / len(results)
+    total_trades = 0
+    total_pnl = 0.0
+    return_sum = 0.0
+    drawdown_sum = 0.0
+    for r in results:
+        total_trades += r.trades
+        total_pnl += r.pnl
+        return_sum += r.return_pct
+        drawdown_sum += r.max_drawdown_pct
+    avg_return = return_sum / len(results)
+    avg_dd = drawdown_sum / len(results)
     return BacktestSummary(
         total_symbols=len(results),
         total_trades=total_trades,
@@ -820,62 +1149,54 @@ def summarize_backtest(results: list[BacktestResult]) -> BacktestSummary:
     )
 
 
+_TRADE_CSV_HEADER = (
+    "symbol,entry_time,exit_time,entry_price,exit_price,shares,entry_value,exit_value,"
+    "profit_loss_abs,profit_loss_pct,cum_profit_loss_abs,cum_profit_loss_pct,cum_equity,exit_reason\r\n"
+)
+_TRADE_CSV_ROW = "{},{},{},{:.6f},{:.6f},{},{:.2f},{:.2f},{:.2f},{:.6f},{:.2f},{:.6f},{:.2f},{}\r\n".format
+_CSV_SPECIAL_CHARS = frozenset(',"\r\n')
+
+
+def _csv_text(value: Any) -> str:
+    # Same minimal quoting csv.writer applies to text fields.
+    text = str(value)
+    if _CSV_SPECIAL_CHARS.isdisjoint(text):
+        return text
+    return '"' + text.replace('"', '""') + '"'
+
+
+def _iter_trade_rows(results: list[BacktestResult], initial_capital: float):
+    cum_pnl = 0.0
+    for res in results:
+        for row in res.trades_detail:
+            cum_pnl += row.pnl
+            cum_pnl_pct = (cum_pnl / initial_capital) if initial_capital > 0 else 0.0
+            yield _TRADE_CSV_ROW(
+                _csv_text(row.symbol),
+                _csv_text(row.entry_time),
+                _csv_text(row.exit_time),
+                row.entry_price,
+                row.exit_price,
+                row.shares,
+                row.entry_price * row.shares,
+                row.exit_price * row.shares,
+                row.pnl,
+                row.return_pct,
+                cum_pnl,
+                cum_pnl_pct,
+                initial_capital + cum_pnl,
+                _csv_text(row.exit_reason),
+            )
+
+
 def export_backtest_trades(
     results: list[BacktestResult],
     output_path: str,
     initial_capital: float = 100_000.0,
 ) -> str:
-    rows: list[BacktestTrade] = []
-    for res in results:
-        rows.extend(res.trades_detail)
-
     path = Path(output_path)
     path.parent.mkdir(parents=True, exist_ok=True)
     with path.open("w", newline="", encoding="utf-8") as f:
-        writer = csv.writer(f)
-        writer.writerow(
-            [
-                "symbol",
-                "entry_time",
-                "exit_time",
-                "entry_price",
-                "exit_price",
-                "shares",
-                "entry_value",
-                "exit_value",
-                "profit_loss_abs",
-                "profit_loss_pct",
-                "cum_profit_loss_abs",
-                "cum_profit_loss_pct",
-                "cum_equity",
-                "exit_reason",
-            ]
-        )
-        cum_pnl = 0.0
-        for row in rows:
-            entry_value = row.entry_price * row.shares
-            exit_value = row.exit_price * row.shares
-            trade_pnl_abs = row.pnl
-            trade_pnl_pct = row.return_pct
-            cum_pnl += trade_pnl_abs
-            cum_pnl_pct = (cum_pnl / initial_capital) if initial_capital > 0 else 0.0
-            cum_equity = initial_capital + cum_pnl
-            writer.writerow(
-                [
-                    row.symbol,
-                    row.entry_time,
-                    row.exit_time,
-                    f"{row.entry_price:.6f}",
-                    f"{row.exit_price:.6f}",
-                    row.shares,
-                    f"{entry_value:.2f}",
-                    f"{exit_value:.2f}",
-                    f"{trade_pnl_abs:.2f}",
-                    f"{trade_pnl_pct:.6f}",
-                    f"{cum_pnl:.2f}",
-                    f"{cum_pnl_pct:.6f}",
-                    f"{cum_equity:.2f}",
-                    row.exit_reason,
-                ]
-            )
+        f.write(_TRADE_CSV_HEADER)
+        f.writelines(_iter_trade_rows(results, initial_capital))
     return str(path)
@@ -7,7 +7,7 @@ from typing import Any
 
 import yaml
 
-from autostock.config import AppConfig
+from autostock.config import AppConfig, YamlLoader
 
 DEFAULT_SCENARIOS: list[dict[str, str]] = [
     {"name": "5min", "duration": "60 D", "bar_size": "5 mins"},
@@ -17,7 +17,7 @@ DEFAULT_SCENARIOS: list[dict[str, str]] = [
 
 def load_grid_spec(path: str | Path) -> dict[str, Any]:
     file_path = Path(path)
-    raw = yaml.safe_load(file_path.read_text(encoding="utf-8")) or {}
+    raw = yaml.load(file_path.read_text(encoding="utf-8"), Loader=YamlLoader) or {}
     if not isinstance(raw, dict):
         raise ValueError("grid config must be a YAML object")
     return raw
@@ -7,7 +7,7 @@ from datetime import datetime
 from pathlib import Path
 import sys
 
-from autostock.backtest import export_backtest_trades, run_backtest, summarize_backtest
+from autostock.backtest import export_backtest_trades, prefetch_backtest_history, run_backtest, summarize_backtest
 from autostock.backtest_grid import (
     apply_overrides,
     generate_grid_overrides,
@@ -22,6 +22,7 @@ from autostock.engine import run_loop, us_market_is_open
 from autostock.ib_client import IBClient
 from autostock.reporting import render_daily_report, render_status
 from autostock.risk import RiskManager
+from autostock.strategy import clear_signal_series_cache
 
 
 def _build_parser() -> argparse.ArgumentParser:
@@ -83,6 +84,12 @@ def _build_parser() -> argparse.ArgumentParser:
         action="store_true",
         help="Ignore backtest historical cache and force fresh IB fetch.",
     )
+    backtest_parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Worker processes for per-symbol simulation; 0 uses all CPUs (default: uses backtest.workers from config).",
+    )
     backtest_grid_parser = sub.add_parser("backtest-grid", help="Run batch backtests using parameter grid YAML")
     backtest_grid_parser.add_argument(
         "--grid",
@@ -117,6 +124,12 @@ def _build_parser() -> argparse.ArgumentParser:
         action="store_true",
         help="Ignore backtest historical cache and force fresh IB fetch.",
     )
+    backtest_grid_parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Worker processes for per-symbol simulation; 0 uses all CPUs (default: uses backtest.workers from config).",
+    )
     backtest_grid_report_parser = sub.add_parser(
         "backtest-grid-report", help="Generate sortable HTML leaderboard from a grid_summary.csv"
     )
@@ -157,6 +170,8 @@ def _doctor(config_path: str) -> int:
     config = _load_effective_config(config_path)
     db = Database(config.database_path)
     db.log_event("INFO", "doctor command started")
+    # Commit now so the write lock is not held while connecting to IB alongside a running engine.
+    db.flush()
     broker = _broker_for_command(config, sidecar_client=True)
 
     print("Config load: OK")
@@ -283,7 +298,77 @@ def _export_backtest_artifacts(
 ) -> None:
     by_symbol_5m = {r.symbol: r for r in results_5m}
     by_symbol_1d = {r.symbol: r for r in results_1d}
-    symbols = sorted(set(by_symbol_5m) | set(by_symbol_1d))
+    # Exports stay in sorted symbol order so summaries line up across runs.
+    symbols = sorted(by_symbol_5m.keys() | by_symbol_1d.keys())
+    master_suffix = [
+        config.strategy_combo.combination_mode,
+        ";".join(config.strategy_combo.enabled_strategies),
+        f"{config.strategy_combo.decision_threshold:.4f}",
+        f"{config.backtest.slippage_bps:.4f}",
+        f"{config.backtest.commission_per_order:.4f}",
+    ]
+    master_rows: list[list[object]] = []
+    for symbol in symbols:
+        symbol_dir = Path("data") / "backtests" / symbol / timestamp
+        symbol_dir.mkdir(parents=True, exist_ok=True)
+
+        res_5m = by_symbol_5m.get(symbol)
+        res_1d = by_symbol_1d.get(symbol)
+        if res_5m is not None:
+            path_5m = export_backtest_trades(
+                [res_5m],
+                str(symbol_dir / "5min.csv"),
+                initial_capital=initial_capital,
+            )
+            print(f"Trades exported: {path_5m}")
+        if res_1d is not None:
+            path_1d = export_backtest_trades(
+                [res_1d],
+                str(symbol_dir / "1d.csv"),
+                initial_capital=initial_capital,
+            )
+            print(f"Trades exported: {path_1d}")
+
+        summary_path = symbol_dir / "summary.csv"
+        with summary_path.open("w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(
+                [
+                    "scenario",
+                    "symbol",
+                    "bars",
+                    "trades",
+                    "wins",
+                    "losses",
+                    "win_rate_pct",
+                    "pnl",
+                    "return_pct",
+                    "max_drawdown_pct",
+                    "initial_capital",
+                ]
+            )
+            for scenario_name, res in [("5min", res_5m), ("1d", res_1d)]:
+                if res is None:
+                    continue
+                win_rate = (res.wins / res.trades * 100.0) if res.trades else 0.0
+                row = [
+                    scenario_name,
+                    res.symbol,
+                    res.bars,
+                    res.trades,
+                    res.wins,
+                    res.losses,
+                    f"{win_rate:.4f}",
+                    f"{res.pnl:.2f}",
+                    f"{res.return_pct*100:.4f}",
+                    f"{res.max_drawdown_pct*100:.4f}",
+                    f"{initial_capital:.2f}",
+                    mode,
+                ]
+                writer.writerow(row)
+                master_rows.append(row + master_suffix)
+        print(f"Summary exported: {summary_path}")
+
     master_path = Path("data") / "backtests" / "_master_summary.csv"
     write_master_header = not master_path.exists()
     master_path.parent.mkdir(parents=True, exist_ok=True)
@@ -312,79 +397,16 @@ def _export_backtest_artifacts(
                     "commission_per_order",
                 ]
             )
-
-        for symbol in symbols:
-            symbol_dir = Path("data") / "backtests" / symbol / timestamp
-            symbol_dir.mkdir(parents=True, exist_ok=True)
-
-            res_5m = by_symbol_5m.get(symbol)
-            res_1d = by_symbol_1d.get(symbol)
-            if res_5m is not None:
-                path_5m = export_backtest_trades(
-                    [res_5m],
-                    str(symbol_dir / "5min.csv"),
-                    initial_capital=initial_capital,
-                )
-                print(f"Trades exported: {path_5m}")
-            if res_1d is not None:
-                path_1d = export_backtest_trades(
-                    [res_1d],
-                    str(symbol_dir / "1d.csv"),
-                    initial_capital=initial_capital,
-                )
-                print(f"Trades exported: {path_1d}")
-
-            summary_path = symbol_dir / "summary.csv"
-            with summary_path.open("w", newline="", encoding="utf-8") as f:
-                writer = csv.writer(f)
-                writer.writerow(
-                    [
-                        "scenario",
-                        "symbol",
-                        "bars",
-                        "trades",
-                        "wins",
-                        "losses",
-                        "win_rate_pct",
-                        "pnl",
-                        "return_pct",
-                        "max_drawdown_pct",
-                        "initial_capital",
-                    ]
-                )
-                for scenario_name, res in [("5min", res_5m), ("1d", res_1d)]:
-                    if res is None:
-                        continue
-                    win_rate = (res.wins / res.trades * 100.0) if res.trades else 0.0
-                    row = [
-                        scenario_name,
-                        res.symbol,
-                        res.bars,
-                        res.trades,
-                        res.wins,
-                        res.losses,
-                        f"{win_rate:.4f}",
-                        f"{res.pnl:.2f}",
-                        f"{res.return_pct*100:.4f}",
-                        f"{res.max_drawdown_pct*100:.4f}",
-                        f"{initial_capital:.2f}",
-                        mode,
-                    ]
-                    writer.writerow(row)
-                    master_writer.writerow(
-                        row
-                        + [
-                            config.strategy_combo.combination_mode,
-                            ";".join(config.strategy_combo.enabled_strategies),
-                            f"{config.strategy_combo.decision_threshold:.4f}",
-                            f"{config.backtest.slippage_bps:.4f}",
-                            f"{config.backtest.commission_per_order:.4f}",
-                        ]
-                    )
-            print(f"Summary exported: {summary_path}")
+        master_writer.writerows(master_rows)
     print(f"Master summary updated: {master_path}")
 
 
+def _with_workers(config: AppConfig, workers: int | None) -> AppConfig:
+    if workers is None:
+        return config
+    return replace(config, backtest=replace(config.backtest, workers=max(0, int(workers))))
+
+
 def _backtest(
     config_path: str,
     initial_capital: float | None,
@@ -392,8 +414,9 @@ def _backtest(
     mode_override: str | None,
     cache_ttl_hours: float,
     refresh_cache: bool,
+    workers: int | None = None,
 ) -> int:
-    config = _load_effective_config(config_path)
+    config = _with_workers(_load_effective_config(config_path), workers)
     selected_symbols = [ticker.strip().upper()] if ticker.strip() else config.symbols
     effective_initial_capital = (
         float(initial_capital) if initial_capital is not None else float(config.capital.max_deploy_usd)
@@ -404,6 +427,15 @@ def _backtest(
     try:
         broker.connect()
         broker.ensure_symbols(selected_symbols)
+        # Uncached histories that fit in one request are fetched together for both scenarios up front.
+        prefetched = prefetch_backtest_history(
+            config,
+            broker,
+            selected_symbols,
+            [("60 D", "5 mins"), ("2 Y", "1 day")],
+            cache_ttl_hours=cache_ttl_hours,
+            refresh_cache=refresh_cache,
+        )
         results_5m = run_backtest(
             config,
             broker,
@@ -414,6 +446,7 @@ def _backtest(
             mode=mode,
             cache_ttl_hours=cache_ttl_hours,
             refresh_cache=refresh_cache,
+            prefetched=prefetched,
         )
         results_1d = run_backtest(
             config,
@@ -425,9 +458,11 @@ def _backtest(
             mode=mode,
             cache_ttl_hours=cache_ttl_hours,
             refresh_cache=refresh_cache,
+            prefetched=prefetched,
         )
     finally:
         broker.disconnect()
+        clear_signal_series_cache()
 
     if mode == "portfolio":
         print(f"Backtest initial portfolio capital: {effective_initial_capital:.2f}")
@@ -462,8 +497,9 @@ def _backtest_grid(
     mode_override: str | None,
     cache_ttl_hours: float,
     refresh_cache: bool,
+    workers: int | None = None,
 ) -> int:
-    base_config = _load_effective_config(config_path)
+    base_config = _with_workers(_load_effective_config(config_path), workers)
     raw_grid = load_grid_spec(grid_path)
     param_grid = normalize_parameter_grid(raw_grid)
     scenarios = grid_scenarios(raw_grid)
@@ -584,6 +620,7 @@ def _backtest_grid(
                     )
         finally:
             broker.disconnect()
+            clear_signal_series_cache()
 
     print(f"Grid summary exported: {summary_path}")
     print(f"Grid trades exported: {trades_dir}")
@@ -622,6 +659,7 @@ def main() -> int:
             args.mode,
             args.cache_ttl_hours,
             args.refresh_cache,
+            args.workers,
         )
     if cmd == "backtest-grid":
         return _backtest_grid(
@@ -632,6 +670,7 @@ def main() -> int:
             args.mode,
             args.cache_ttl_hours,
             args.refresh_cache,
+            args.workers,
         )
     if cmd == "backtest-grid-report":
         return _backtest_grid_report(args.summary, args.output)
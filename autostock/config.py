@@ -1,16 +1,22 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
 from typing import Any
 
 import yaml
 
+try:
+    from yaml import CSafeLoader as YamlLoader
+except ImportError:  # PyYAML built without libyaml
+    from yaml import SafeLoader as YamlLoader
+
 DEFAULT_BASE_CONFIG = "config/config.yaml"
 DEFAULT_LOCAL_CONFIG = "config/config.local.yaml"
 
 
-@dataclass(slots=True)
+@dataclass(slots=True, frozen=True)
 class RiskConfig:
     max_position_pct: float
     stop_loss_pct: float
@@ -20,7 +26,7 @@ class RiskConfig:
     max_consecutive_losses: int = 3
 
 
-@dataclass(slots=True)
+@dataclass(slots=True, frozen=True)
 class StrategyConfig:
     short_window: int
     long_window: int
@@ -32,14 +38,14 @@ class StrategyConfig:
     cache_max_bars: int = 10000
 
 
-@dataclass(slots=True)
+@dataclass(slots=True, frozen=True)
 class RSIConfig:
     window: int
     oversold: float
     overbought: float
 
 
-@dataclass(slots=True)
+@dataclass(slots=True, frozen=True)
 class StrategyComboConfig:
     enabled_strategies: list[str]
     combination_mode: str
@@ -48,20 +54,22 @@ class StrategyComboConfig:
     rsi: RSIConfig
 
 
-@dataclass(slots=True)
+@dataclass(slots=True, frozen=True)
 class CapitalConfig:
     max_deploy_usd: float
 
 
-@dataclass(slots=True)
+@dataclass(slots=True, frozen=True)
 class BacktestConfig:
     mode: str
     slippage_bps: float
     commission_per_order: float
     min_order_notional: float
+    workers: int = 1
+    fetch_concurrency: int = 4
 
 
-@dataclass(slots=True)
+@dataclass(slots=True, frozen=True)
 class IBConfig:
     host: str
     port: int
@@ -70,7 +78,7 @@ class IBConfig:
     trading_mode: str
 
 
-@dataclass(slots=True)
+@dataclass(slots=True, frozen=True)
 class AppConfig:
     symbols: list[str]
     risk: RiskConfig
@@ -91,16 +99,26 @@ def _require(data: dict[str, Any], key: str) -> Any:
 
 
 def _load_yaml(path: str | Path) -> dict[str, Any]:
-    file_path = Path(path)
-    with file_path.open("r", encoding="utf-8") as f:
-        return yaml.safe_load(f) or {}
+    file_path = Path(path).resolve()
+    stat = file_path.stat()
+    return _parse_yaml_file(str(file_path), stat.st_mtime_ns, stat.st_size)
+
+
+# Keyed on mtime/size so an edited file is re-read; the cached dict is shared, callers must not mutate it.
+@lru_cache(maxsize=8)
+def _parse_yaml_file(path: str, mtime_ns: int, size: int) -> dict[str, Any]:
+    with open(path, "r", encoding="utf-8") as f:
+        return yaml.load(f, Loader=YamlLoader) or {}
 
 
 def _deep_merge(base: dict[str, Any], override: dict[str, Any]) -> dict[str, Any]:
     out = dict(base)
     for key, value in override.items():
-        if isinstance(value, dict) and isinstance(out.get(key), dict):
-            out[key] = _deep_merge(out[key], value)
+        current = out.get(key)
+        if isinstance(value, dict) and isinstance(current, dict):
+            # An empty override section leaves the base section as-is.
+            if value:
+                out[key] = _deep_merge(current, value)
         else:
             out[key] = value
     return out
@@ -115,9 +133,7 @@ def _optional_positive_int(value: Any) -> int | None:
     return parsed
 
 
-def load_config(path: str | Path) -> AppConfig:
-    raw = _load_yaml(path)
-
+def _build_config(raw: dict[str, Any]) -> AppConfig:
     risk_raw = _require(raw, "risk")
     strategy_raw = _require(raw, "strategy")
     ib_raw = _require(raw, "ib")
@@ -165,6 +181,8 @@ def load_config(path: str | Path) -> AppConfig:
             slippage_bps=float(backtest_raw.get("slippage_bps", 5.0)),
             commission_per_order=float(backtest_raw.get("commission_per_order", 1.0)),
             min_order_notional=float(backtest_raw.get("min_order_notional", 100.0)),
+            workers=max(0, int(backtest_raw.get("workers", 1))),
+            fetch_concurrency=max(1, int(backtest_raw.get("fetch_concurrency", 4))),
         ),
         ib=IBConfig(
             host=str(_require(ib_raw, "host")),
@@ -179,69 +197,14 @@ def load_config(path: str | Path) -> AppConfig:
     )
 
 
+def load_config(path: str | Path) -> AppConfig:
+    return _build_config(_load_yaml(path))
+
+
 def load_default_config() -> AppConfig:
     base_path = Path(DEFAULT_BASE_CONFIG)
     local_path = Path(DEFAULT_LOCAL_CONFIG)
     raw = _load_yaml(base_path)
     if local_path.exists():
         raw = _deep_merge(raw, _load_yaml(local_path))
-
-    risk_raw = _require(raw, "risk")
-    strategy_raw = _require(raw, "strategy")
-    ib_raw = _require(raw, "ib")
-    combo_raw = dict(raw.get("strategy_combo", {}))
-    rsi_raw = dict(combo_raw.get("rsi", {}))
-    capital_raw = dict(raw.get("capital", {}))
-    backtest_raw = dict(raw.get("backtest", {}))
-
-    return AppConfig(
-        symbols=list(_require(raw, "symbols")),
-        risk=RiskConfig(
-            max_position_pct=float(_require(risk_raw, "max_position_pct")),
-            stop_loss_pct=float(_require(risk_raw, "stop_loss_pct")),
-            symbol_daily_loss_pct=float(_require(risk_raw, "symbol_daily_loss_pct")),
-            account_daily_drawdown_pct=float(_require(risk_raw, "account_daily_drawdown_pct")),
-            max_open_positions=int(risk_raw.get("max_open_positions", 10)),
-            max_consecutive_losses=int(risk_raw.get("max_consecutive_losses", 3)),
-        ),
-        strategy=StrategyConfig(
-            short_window=int(_require(strategy_raw, "short_window")),
-            long_window=int(_require(strategy_raw, "long_window")),
-            bar_size=str(_require(strategy_raw, "bar_size")),
-            duration=str(_require(strategy_raw, "duration")),
-            loop_interval_seconds=int(_require(strategy_raw, "loop_interval_seconds")),
-            data_poll_seconds=_optional_positive_int(strategy_raw.get("data_poll_seconds")),
-            incremental_duration=str(strategy_raw.get("incremental_duration", "3 D")),
-            cache_max_bars=max(500, int(strategy_raw.get("cache_max_bars", 10000))),
-        ),
-        strategy_combo=StrategyComboConfig(
-            enabled_strategies=[str(x).lower() for x in combo_raw.get("enabled_strategies", ["ma"])],
-            combination_mode=str(combo_raw.get("combination_mode", "weighted")).lower(),
-            decision_threshold=float(combo_raw.get("decision_threshold", 0.0)),
-            weights={str(k).lower(): float(v) for k, v in dict(combo_raw.get("weights", {"ma": 1.0})).items()},
-            rsi=RSIConfig(
-                window=int(rsi_raw.get("window", 14)),
-                oversold=float(rsi_raw.get("oversold", 30.0)),
-                overbought=float(rsi_raw.get("overbought", 70.0)),
-            ),
-        ),
-        capital=CapitalConfig(
-            max_deploy_usd=float(capital_raw.get("max_deploy_usd", 10000.0)),
-        ),
-        backtest=BacktestConfig(
-            mode=str(backtest_raw.get("mode", "portfolio")).lower(),
-            slippage_bps=float(backtest_raw.get("slippage_bps", 5.0)),
-            commission_per_order=float(backtest_raw.get("commission_per_order", 1.0)),
-            min_order_notional=float(backtest_raw.get("min_order_notional", 100.0)),
-        ),
-        ib=IBConfig(
-            host=str(_require(ib_raw, "host")),
-            port=int(_require(ib_raw, "port")),
-            client_id=int(_require(ib_raw, "client_id")),
-            account=str(_require(ib_raw, "account")),
-            trading_mode=str(_require(ib_raw, "trading_mode")),
-        ),
-        timezone=str(raw.get("timezone", "America/New_York")),
-        database_path=str(raw.get("database_path", "data/autostock.db")),
-        log_level=str(raw.get("log_level", "INFO")),
-    )
+    return _build_config(raw)
@@ -2,26 +2,62 @@ from __future__ import annotations
 
 import json
 import sqlite3
-from collections import defaultdict
-from datetime import datetime, timezone
+from datetime import date, datetime, timedelta, timezone
 from pathlib import Path
-from typing import Any
+from typing import Any, Iterable
 from zoneinfo import ZoneInfo
 
 
+_BUY_SIDES = frozenset({"BUY", "BOT"})
+_SELL_SIDES = frozenset({"SELL", "SLD"})
+
+_UPSERT_EXECUTION_SQL = """
+    INSERT INTO executions (exec_id, ts_utc, account, symbol, side, quantity, price, order_id, perm_id)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT(exec_id) DO UPDATE SET
+        ts_utc=excluded.ts_utc,
+        account=excluded.account,
+        symbol=excluded.symbol,
+        side=excluded.side,
+        quantity=excluded.quantity,
+        price=excluded.price,
+        order_id=excluded.order_id,
+        perm_id=excluded.perm_id
+"""
+
+# Bump whenever the schema script changes so existing database files pick it up.
+_SCHEMA_VERSION = 1
+
+
 def utc_now_iso() -> str:
     return datetime.now(timezone.utc).isoformat()
 
 
+def _local_midnight_utc(day: date, tz: ZoneInfo) -> datetime:
+    return datetime(day.year, day.month, day.day, tzinfo=tz).astimezone(timezone.utc)
+
+
 class Database:
     def __init__(self, db_path: str) -> None:
         self.db_path = db_path
         Path(db_path).parent.mkdir(parents=True, exist_ok=True)
         self.conn = sqlite3.connect(db_path)
         self.conn.row_factory = sqlite3.Row
+        # Writes are committed in batches via flush(); WAL keeps readers (status/report) unblocked meanwhile.
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("PRAGMA temp_store=MEMORY")
         self._init_schema()
 
+    def __enter__(self) -> Database:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
     def _init_schema(self) -> None:
+        if self.conn.execute("PRAGMA user_version").fetchone()[0] >= _SCHEMA_VERSION:
+            return
         cur = self.conn.cursor()
         cur.executescript(
             """
@@ -70,8 +106,14 @@ class Database:
                 order_id INTEGER,
                 perm_id INTEGER
             );
+
+            CREATE INDEX IF NOT EXISTS idx_executions_ts ON executions (ts_utc, exec_id);
+            CREATE INDEX IF NOT EXISTS idx_snapshots_symbol_ts ON snapshots (symbol, ts_utc);
+            CREATE INDEX IF NOT EXISTS idx_orders_ts ON orders (ts_utc);
+            CREATE INDEX IF NOT EXISTS idx_events_ts ON events (ts_utc);
             """
         )
+        self.conn.execute(f"PRAGMA user_version = {_SCHEMA_VERSION}")
         self.conn.commit()
 
     def log_event(self, level: str, message: str) -> None:
@@ -79,7 +121,6 @@ class Database:
             "INSERT INTO events (ts_utc, level, message) VALUES (?, ?, ?)",
             (utc_now_iso(), level.upper(), message),
         )
-        self.conn.commit()
 
     def record_order(
         self,
@@ -98,7 +139,6 @@ class Database:
             """,
             (utc_now_iso(), symbol, side, quantity, signal, status, price, note),
         )
-        self.conn.commit()
 
     def record_snapshot(
         self, symbol: str, position: float, avg_cost: float, last_price: float, unrealized_pnl: float
@@ -110,7 +150,6 @@ class Database:
             """,
             (utc_now_iso(), symbol, position, avg_cost, last_price, unrealized_pnl),
         )
-        self.conn.commit()
 
     def set_state(self, key: str, value: Any) -> None:
         encoded = json.dumps(value)
@@ -118,11 +157,9 @@ class Database:
             "INSERT INTO app_state (key, value) VALUES (?, ?) ON CONFLICT(key) DO UPDATE SET value=excluded.value",
             (key, encoded),
         )
-        self.conn.commit()
 
     def delete_state_prefix(self, prefix: str) -> None:
         self.conn.execute("DELETE FROM app_state WHERE key LIKE ?", (f"{prefix}%",))
-        self.conn.commit()
 
     def get_state(self, key: str, default: Any = None) -> Any:
         row = self.conn.execute("SELECT value FROM app_state WHERE key = ?", (key,)).fetchone()
@@ -143,22 +180,13 @@ class Database:
         perm_id: int | None,
     ) -> None:
         self.conn.execute(
-            """
-            INSERT INTO executions (exec_id, ts_utc, account, symbol, side, quantity, price, order_id, perm_id)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-            ON CONFLICT(exec_id) DO UPDATE SET
-                ts_utc=excluded.ts_utc,
-                account=excluded.account,
-                symbol=excluded.symbol,
-                side=excluded.side,
-                quantity=excluded.quantity,
-                price=excluded.price,
-                order_id=excluded.order_id,
-                perm_id=excluded.perm_id
-            """,
+            _UPSERT_EXECUTION_SQL,
             (exec_id, ts_utc, account, symbol, side, quantity, price, order_id, perm_id),
         )
-        self.conn.commit()
+
+    def upsert_executions(self, rows: Iterable[tuple[Any, ...]]) -> None:
+        # Rows are (exec_id, ts_utc, account, symbol, side, quantity, price, order_id, perm_id).
+        self.conn.executemany(_UPSERT_EXECUTION_SQL, rows)
 
     def latest_execution_ts(self) -> str | None:
         row = self.conn.execute("SELECT MAX(ts_utc) AS ts FROM executions").fetchone()
@@ -172,28 +200,39 @@ class Database:
         ).fetchall()
 
     def rebuild_daily_risk_state(self, tz_name: str) -> tuple[dict[str, float], int]:
-        rows = self.executions_ordered()
+        # Average cost is a running recurrence over every prior fill, so rows are folded in
+        # order; only the needed columns are read, as plain tuples.
+        cur = self.conn.cursor()
+        cur.row_factory = None
+        rows = cur.execute(
+            "SELECT symbol, side, quantity, price, ts_utc FROM executions ORDER BY ts_utc ASC, exec_id ASC"
+        ).fetchall()
         if not rows:
             return {}, 0
 
-        today = datetime.now(ZoneInfo(tz_name)).date().isoformat()
-        position_qty: dict[str, float] = defaultdict(float)
-        avg_cost: dict[str, float] = defaultdict(float)
-        symbol_realized_today: dict[str, float] = defaultdict(float)
+        tz = ZoneInfo(tz_name)
+        today = datetime.now(tz).date()
+        # Synced timestamps are isoformat() UTC strings, which sort chronologically, so
+        # "today" is a string range check; anything else is parsed.
+        today_start_iso = _local_midnight_utc(today, tz).isoformat()
+        today_end_iso = _local_midnight_utc(today + timedelta(days=1), tz).isoformat()
+        position_qty: dict[str, float] = {}
+        avg_cost: dict[str, float] = {}
+        symbol_realized_today: dict[str, float] = {}
+        get_qty = position_qty.get
+        get_avg = avg_cost.get
         consecutive_losses_today = 0
 
-        for row in rows:
-            symbol = str(row["symbol"])
-            side = str(row["side"]).upper()
-            qty = float(row["quantity"])
-            price = float(row["price"])
-            ts = datetime.fromisoformat(str(row["ts_utc"]))
-            trade_day = ts.astimezone(ZoneInfo(tz_name)).date().isoformat()
+        for symbol, side, qty, price, ts_utc in rows:
+            symbol = str(symbol)
+            side = str(side).upper()
+            qty = float(qty)
+            price = float(price)
 
-            current_qty = position_qty[symbol]
-            current_avg = avg_cost[symbol]
+            current_qty = get_qty(symbol, 0.0)
+            current_avg = get_avg(symbol, 0.0)
 
-            if side in {"BUY", "BOT"}:
+            if side in _BUY_SIDES:
                 new_qty = current_qty + qty
                 if new_qty <= 0:
                     position_qty[symbol] = 0.0
@@ -203,34 +242,36 @@ class Database:
                     position_qty[symbol] = new_qty
                 continue
 
-            if side in {"SELL", "SLD"}:
+            if side in _SELL_SIDES:
+                # Only sells count toward today's realized PnL, so buys skip the timestamp parse.
+                ts_text = str(ts_utc)
+                if ts_text.endswith("+00:00") and ts_text[10:11] == "T":
+                    is_today = today_start_iso <= ts_text < today_end_iso
+                else:
+                    is_today = datetime.fromisoformat(ts_text).astimezone(tz).date() == today
                 sell_qty = min(current_qty, qty) if current_qty > 0 else qty
                 realized = (price - current_avg) * sell_qty
-                position_qty[symbol] = max(0.0, current_qty - qty)
-                if position_qty[symbol] == 0:
+                remaining = max(0.0, current_qty - qty)
+                position_qty[symbol] = remaining
+                if remaining == 0:
                     avg_cost[symbol] = 0.0
-                if trade_day == today:
-                    symbol_realized_today[symbol] += realized
+                if is_today:
+                    symbol_realized_today[symbol] = symbol_realized_today.get(symbol, 0.0) + realized
                     if realized < 0:
                         consecutive_losses_today += 1
                     else:
                         consecutive_losses_today = 0
                 continue
 
-        return dict(symbol_realized_today), consecutive_losses_today
+        return symbol_realized_today, consecutive_losses_today
 
     def latest_snapshots(self) -> list[sqlite3.Row]:
         return self.conn.execute(
             """
-            SELECT s.*
-            FROM snapshots s
-            INNER JOIN (
-                SELECT symbol, MAX(ts_utc) AS max_ts
-                FROM snapshots
-                GROUP BY symbol
-            ) x
-              ON x.symbol = s.symbol AND x.max_ts = s.ts_utc
-            ORDER BY s.symbol
+            SELECT *
+            FROM snapshots
+            WHERE id IN (SELECT MAX(id) FROM snapshots GROUP BY symbol)
+            ORDER BY symbol
             """
         ).fetchall()
 
@@ -240,11 +281,52 @@ class Database:
             (iso_ts,),
         ).fetchall()
 
-    def events_since(self, iso_ts: str) -> list[sqlite3.Row]:
+    def orders_summary_since(self, iso_ts: str) -> sqlite3.Row:
         return self.conn.execute(
-            "SELECT * FROM events WHERE ts_utc >= ? ORDER BY ts_utc DESC",
+            """
+            SELECT
+                COUNT(*) AS orders,
+                TOTAL(side = 'BUY') AS buy,
+                TOTAL(side = 'SELL') AS sell,
+                TOTAL(
+                    CASE
+                        WHEN price IS NULL THEN 0
+                        WHEN side = 'SELL' THEN price * quantity
+                        WHEN side = 'BUY' THEN -price * quantity
+                        ELSE 0
+                    END
+                ) AS cash_pnl
+            FROM orders
+            WHERE ts_utc >= ?
+            """,
             (iso_ts,),
+        ).fetchone()
+
+    def cash_pnl_by_symbol_since(self, iso_ts: str, limit: int = 10) -> list[tuple[str, float]]:
+        return self.conn.execute(
+            """
+            SELECT symbol, TOTAL(CASE WHEN side = 'SELL' THEN price * quantity ELSE -price * quantity END) AS cash_pnl
+            FROM orders
+            WHERE ts_utc >= ? AND price IS NOT NULL AND side IN ('BUY', 'SELL')
+            GROUP BY symbol
+            ORDER BY cash_pnl DESC, symbol
+            LIMIT ?
+            """,
+            (iso_ts, limit),
+        ).fetchall()
+
+    def events_since(self, iso_ts: str, limit: int | None = None) -> list[sqlite3.Row]:
+        return self.conn.execute(
+            "SELECT * FROM events WHERE ts_utc >= ? ORDER BY ts_utc DESC LIMIT ?",
+            (iso_ts, -1 if limit is None else limit),
         ).fetchall()
 
+    def count_events_since(self, iso_ts: str) -> int:
+        return int(self.conn.execute("SELECT COUNT(*) FROM events WHERE ts_utc >= ?", (iso_ts,)).fetchone()[0])
+
+    def flush(self) -> None:
+        self.conn.commit()
+
     def close(self) -> None:
+        self.conn.commit()
         self.conn.close()
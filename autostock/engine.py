@@ -6,10 +6,13 @@ import asyncio
 import threading
 import time
 import json
+import os
 import re
-from dataclasses import dataclass, replace
+import sqlite3
+from dataclasses import dataclass, field, replace
 from datetime import UTC, datetime, time as dtime
 from pathlib import Path
+from typing import Any
 from zoneinfo import ZoneInfo
 
 from autostock.config import AppConfig, IBConfig
@@ -26,6 +29,10 @@ class EngineContext:
     broker: IBClient
     risk: RiskManager
     shutdown: bool = False
+    min_log_level: int = 20
+    # Write-through copy of the app_state keys this engine owns, cleared when the trading day changes.
+    state_day: str = ""
+    state_cache: dict[str, Any] = field(default_factory=dict)
 
 
 @dataclass(slots=True)
@@ -61,6 +68,7 @@ def _parse_bar_datetime(value: str, tz_name: str) -> datetime | None:
     raw = str(value).strip()
     if not raw:
         return None
+    tz = ZoneInfo(tz_name)
     candidates = [
         raw,
         raw.replace("  ", " "),
@@ -69,14 +77,14 @@ def _parse_bar_datetime(value: str, tz_name: str) -> datetime | None:
         try:
             dt = datetime.fromisoformat(candidate)
             if dt.tzinfo is None:
-                dt = dt.replace(tzinfo=ZoneInfo(tz_name))
+                dt = dt.replace(tzinfo=tz)
             return dt
         except ValueError:
             pass
         for fmt in ("%Y%m%d %H:%M:%S", "%Y-%m-%d %H:%M:%S", "%Y%m%d"):
             try:
                 dt = datetime.strptime(candidate, fmt)
-                dt = dt.replace(tzinfo=ZoneInfo(tz_name))
+                dt = dt.replace(tzinfo=tz)
                 return dt
             except ValueError:
                 continue
@@ -135,26 +143,50 @@ def now_in_tz(tz_name: str) -> datetime:
     return datetime.now(ZoneInfo(tz_name))
 
 
+_MARKET_OPEN = dtime(9, 30)
+_MARKET_CLOSE = dtime(16, 0)
+# (tz_name, epoch minute, is_open): the session bounds fall on whole minutes, so the answer
+# only changes between minutes. Shared by the engine loop and the market-data feed thread.
+_market_open_cache: tuple[str, int, bool] | None = None
+
+
 def us_market_is_open(tz_name: str) -> bool:
-    now = now_in_tz(tz_name)
-    if now.weekday() > 4:
-        return False
-    market_open = dtime(9, 30)
-    market_close = dtime(16, 0)
-    current = now.time()
-    return market_open <= current <= market_close
+    global _market_open_cache
+    ts = time.time()
+    minute = int(ts // 60)
+    cached = _market_open_cache
+    if cached is not None and cached[0] == tz_name and cached[1] == minute:
+        return cached[2]
+    now = datetime.fromtimestamp(ts, ZoneInfo(tz_name))
+    is_open = now.weekday() <= 4 and _MARKET_OPEN <= now.time() <= _MARKET_CLOSE
+    _market_open_cache = (tz_name, minute, is_open)
+    return is_open
 
 
 def _today_key(tz_name: str) -> str:
     return now_in_tz(tz_name).date().isoformat()
 
 
+def _get_state(ctx: EngineContext, key: str, default: Any = None) -> Any:
+    if key not in ctx.state_cache:
+        ctx.state_cache[key] = ctx.db.get_state(key, default)
+    return ctx.state_cache[key]
+
+
+def _set_state(ctx: EngineContext, key: str, value: Any) -> None:
+    ctx.db.set_state(key, value)
+    ctx.state_cache[key] = value
+
+
 def _ensure_day_start_equity(ctx: EngineContext, equity: float) -> float:
     day_key = _today_key(ctx.config.timezone)
+    if ctx.state_day != day_key:
+        ctx.state_cache.clear()
+        ctx.state_day = day_key
     key = f"day_start_equity:{day_key}"
-    stored = ctx.db.get_state(key)
+    stored = _get_state(ctx, key)
     if stored is None:
-        ctx.db.set_state(key, equity)
+        _set_state(ctx, key, equity)
         return float(equity)
     return float(stored)
 
@@ -162,23 +194,34 @@ def _ensure_day_start_equity(ctx: EngineContext, equity: float) -> float:
 def _symbol_realized_pnl_today(ctx: EngineContext, symbol: str) -> float:
     day_key = _today_key(ctx.config.timezone)
     key = f"symbol_realized:{day_key}:{symbol}"
-    return float(ctx.db.get_state(key, 0.0))
+    return float(_get_state(ctx, key, 0.0))
 
 
 def _add_symbol_realized_pnl(ctx: EngineContext, symbol: str, delta: float) -> None:
     day_key = _today_key(ctx.config.timezone)
     key = f"symbol_realized:{day_key}:{symbol}"
-    existing = float(ctx.db.get_state(key, 0.0))
-    ctx.db.set_state(key, existing + delta)
+    existing = float(_get_state(ctx, key, 0.0))
+    _set_state(ctx, key, existing + delta)
 
 
 def _set_symbol_realized_pnl_today(ctx: EngineContext, symbol: str, value: float) -> None:
     day_key = _today_key(ctx.config.timezone)
     key = f"symbol_realized:{day_key}:{symbol}"
-    ctx.db.set_state(key, float(value))
+    _set_state(ctx, key, float(value))
+
+
+_LOG_LEVELS = {"DEBUG": 10, "INFO": 20, "WARN": 30, "WARNING": 30, "ERROR": 40}
+
+
+def _engine_log_level(config: AppConfig) -> int:
+    # Same precedence as backtest logging: AUTOSTOCK_LOG_LEVEL, then config.log_level.
+    level = os.environ.get("AUTOSTOCK_LOG_LEVEL") or config.log_level or "INFO"
+    return _LOG_LEVELS.get(level.upper(), 20)
 
 
 def _mark_event(ctx: EngineContext, level: str, message: str) -> None:
+    if _LOG_LEVELS.get(level, 20) < ctx.min_log_level:
+        return
     ctx.db.log_event(level, message)
     ts = now_in_tz(ctx.config.timezone).strftime("%Y-%m-%d %H:%M:%S.%f")[:-3]
     print(f"[{level}] [{ts}] {message}")
@@ -213,6 +256,9 @@ def _data_poll_seconds(config: AppConfig) -> int:
     return max(15, bar_seconds // 2)
 
 
+_FEED_FETCH_CONCURRENCY = 8
+
+
 class MarketDataFeed:
     def __init__(self, config: AppConfig, symbols: list[str], ib_cfg: IBConfig) -> None:
         self.config = config
@@ -264,47 +310,7 @@ class MarketDataFeed:
                     if not us_market_is_open(self.config.timezone):
                         _sleep_with_stop(self.stop_event, self.poll_seconds)
                         continue
-                    for symbol in self.symbols:
-                        if self.stop_event.is_set():
-                            break
-                        existing_pairs = self.cached_bars.get(symbol, [])
-                        duration = self._next_duration(symbol, existing_pairs)
-                        fetch_start = time.perf_counter()
-                        bars = broker.get_historical_bars(
-                            symbol=symbol,
-                            duration=duration,
-                            bar_size=self.config.strategy.bar_size,
-                        )
-                        fetch_elapsed = time.perf_counter() - fetch_start
-                        _print_runtime_log(
-                            "DEBUG",
-                            (
-                                f"{symbol}: data_fetch_elapsed={fetch_elapsed:.3f}s duration={duration} "
-                                f"fetched_bars={len(bars)} cached_bars={len(existing_pairs)}"
-                            ),
-                            self.config.timezone,
-                        )
-                        if not bars:
-                            continue
-                        fetched_pairs = [(str(bar.date), float(bar.close)) for bar in bars]
-                        merged_pairs = _merge_cached_bars(
-                            existing_pairs,
-                            fetched_pairs,
-                            max_bars=self.config.strategy.cache_max_bars,
-                        )
-                        self.cached_bars[symbol] = merged_pairs
-                        self._save_symbol_cache(symbol, merged_pairs)
-                        closes = [close for _date, close in merged_pairs]
-                        last_date = merged_pairs[-1][0]
-                        last_close = merged_pairs[-1][1]
-                        last_bar_key = f"{last_date}|{last_close:.6f}|{len(closes)}"
-                        if self.last_seen_key.get(symbol) == last_bar_key:
-                            continue
-                        self.last_seen_key[symbol] = last_bar_key
-                        update = MarketDataUpdate(symbol=symbol, closes=closes, last_bar_key=last_bar_key)
-                        with self.lock:
-                            self.latest[symbol] = update
-                        self.update_queue.put(symbol)
+                    self._poll_once(broker)
                 except Exception as exc:  # noqa: BLE001
                     _print_runtime_log("WARN", f"market data feed error: {exc}", self.config.timezone)
                 finally:
@@ -317,6 +323,59 @@ class MarketDataFeed:
             loop.close()
         _print_runtime_log("INFO", "market data feed stopped", self.config.timezone)
 
+    def _poll_once(self, broker: IBClient) -> None:
+        bar_size = self.config.strategy.bar_size
+        durations = {symbol: self._next_duration(symbol, self.cached_bars.get(symbol, [])) for symbol in self.symbols}
+        # One concurrent batch per poll instead of a serial round-trip per symbol.
+        fetch_start = time.perf_counter()
+        errors: dict[tuple[str, str, str], BaseException] = {}
+        fetched = broker.get_historical_bars_bulk(
+            [(symbol, duration, bar_size) for symbol, duration in durations.items()],
+            max_concurrency=min(_FEED_FETCH_CONCURRENCY, len(durations)),
+            errors=errors,
+        )
+        fetch_elapsed = time.perf_counter() - fetch_start
+        _print_runtime_log(
+            "DEBUG",
+            f"data_fetch_elapsed={fetch_elapsed:.3f}s symbols={len(durations)}",
+            self.config.timezone,
+        )
+        for symbol, duration in durations.items():
+            if self.stop_event.is_set():
+                break
+            error = errors.get((symbol, duration, bar_size))
+            if error is not None:
+                _print_runtime_log("WARN", f"market data feed error: {symbol}: {error}", self.config.timezone)
+                continue
+            existing_pairs = self.cached_bars.get(symbol, [])
+            bars = fetched.get((symbol, duration, bar_size), [])
+            _print_runtime_log(
+                "DEBUG",
+                f"{symbol}: duration={duration} fetched_bars={len(bars)} cached_bars={len(existing_pairs)}",
+                self.config.timezone,
+            )
+            if not bars:
+                continue
+            fetched_pairs = [(str(bar.date), float(bar.close)) for bar in bars]
+            merged_pairs = _merge_cached_bars(
+                existing_pairs,
+                fetched_pairs,
+                max_bars=self.config.strategy.cache_max_bars,
+            )
+            self.cached_bars[symbol] = merged_pairs
+            self._save_symbol_cache(symbol, merged_pairs)
+            closes = [close for _date, close in merged_pairs]
+            last_date = merged_pairs[-1][0]
+            last_close = merged_pairs[-1][1]
+            last_bar_key = f"{last_date}|{last_close:.6f}|{len(closes)}"
+            if self.last_seen_key.get(symbol) == last_bar_key:
+                continue
+            self.last_seen_key[symbol] = last_bar_key
+            update = MarketDataUpdate(symbol=symbol, closes=closes, last_bar_key=last_bar_key)
+            with self.lock:
+                self.latest[symbol] = update
+            self.update_queue.put(symbol)
+
     def _cache_file(self, symbol: str) -> Path:
         bar_key = _safe_cache_token(self.config.strategy.bar_size)
         duration_key = _safe_cache_token(self.config.strategy.duration)
@@ -384,12 +443,12 @@ def _effective_equity(ctx: EngineContext, ib_equity: float) -> float:
 
 def _consecutive_losses_today(ctx: EngineContext) -> int:
     day_key = _today_key(ctx.config.timezone)
-    return int(ctx.db.get_state(f"consecutive_losses:{day_key}", 0))
+    return int(_get_state(ctx, f"consecutive_losses:{day_key}", 0))
 
 
 def _set_consecutive_losses_today(ctx: EngineContext, value: int) -> None:
     day_key = _today_key(ctx.config.timezone)
-    ctx.db.set_state(f"consecutive_losses:{day_key}", int(max(0, value)))
+    _set_state(ctx, f"consecutive_losses:{day_key}", int(max(0, value)))
 
 
 def _update_consecutive_losses_after_exit(ctx: EngineContext, realized_pnl: float) -> None:
@@ -403,27 +462,20 @@ def _update_consecutive_losses_after_exit(ctx: EngineContext, realized_pnl: floa
 def _startup_sync(ctx: EngineContext) -> None:
     last_sync = ctx.db.latest_execution_ts()
     executions = ctx.broker.get_executions_since(last_sync)
-    new_count = 0
-    for exe in executions:
-        ctx.db.upsert_execution(
-            exec_id=exe.exec_id,
-            ts_utc=exe.ts_utc,
-            account=exe.account,
-            symbol=exe.symbol,
-            side=exe.side,
-            quantity=exe.quantity,
-            price=exe.price,
-            order_id=exe.order_id,
-            perm_id=exe.perm_id,
-        )
-        new_count += 1
+    ctx.db.upsert_executions(
+        (exe.exec_id, exe.ts_utc, exe.account, exe.symbol, exe.side, exe.quantity, exe.price, exe.order_id, exe.perm_id)
+        for exe in executions
+    )
+    new_count = len(executions)
 
     symbol_pnl, consecutive_losses = ctx.db.rebuild_daily_risk_state(ctx.config.timezone)
     day_key = _today_key(ctx.config.timezone)
     ctx.db.delete_state_prefix(f"symbol_realized:{day_key}:")
+    ctx.state_cache.clear()
     for symbol, pnl in symbol_pnl.items():
         _set_symbol_realized_pnl_today(ctx, symbol, pnl)
     _set_consecutive_losses_today(ctx, consecutive_losses)
+    ctx.db.flush()
 
     positions = ctx.broker.get_positions()
     position_symbols = sorted(symbol for symbol, p in positions.items() if p.quantity > 0)
@@ -466,6 +518,8 @@ def _execute_symbol(ctx: EngineContext, symbol: str, equity: float, positions: d
 
     if position.quantity > 0 and ctx.risk.stop_loss_triggered(position.avg_cost, last_price):
         qty = int(position.quantity)
+        # Order submission can block on IB; never hold the database write lock across it.
+        ctx.db.flush()
         status = ctx.broker.submit_market_order(symbol, "SELL", qty)
         approx_realized = (last_price - position.avg_cost) * qty
         _update_consecutive_losses_after_exit(ctx, approx_realized)
@@ -493,6 +547,7 @@ def _execute_symbol(ctx: EngineContext, symbol: str, equity: float, positions: d
         if qty <= 0:
             _mark_event(ctx, "WARN", f"{symbol}: computed order quantity is 0")
             return
+        ctx.db.flush()
         status = ctx.broker.submit_market_order(symbol, "BUY", qty)
         ctx.db.record_order(symbol, "BUY", qty, "STRATEGY_BUY", status, price=last_price, note=decision_detail)
         _mark_event(ctx, "INFO", f"{symbol}: BUY {qty} @ {last_price:.2f} ({status}) [{decision_detail}]")
@@ -501,6 +556,7 @@ def _execute_symbol(ctx: EngineContext, symbol: str, equity: float, positions: d
 
     if signal_ == Signal.SELL and position.quantity > 0:
         qty = int(position.quantity)
+        ctx.db.flush()
         status = ctx.broker.submit_market_order(symbol, "SELL", qty)
         approx_realized = (last_price - position.avg_cost) * qty
         _update_consecutive_losses_after_exit(ctx, approx_realized)
@@ -515,7 +571,7 @@ def _execute_symbol(ctx: EngineContext, symbol: str, equity: float, positions: d
 
 
 def run_loop(config: AppConfig, db: Database, broker: IBClient, risk: RiskManager) -> None:
-    ctx = EngineContext(config=config, db=db, broker=broker, risk=risk)
+    ctx = EngineContext(config=config, db=db, broker=broker, risk=risk, min_log_level=_engine_log_level(config))
     data_feed: MarketDataFeed | None = None
 
     def _shutdown_handler(sig: int, _frame: object) -> None:
@@ -528,7 +584,9 @@ def run_loop(config: AppConfig, db: Database, broker: IBClient, risk: RiskManage
     signal.signal(signal.SIGTERM, _shutdown_handler)
 
     _mark_event(ctx, "INFO", "autostock engine started")
+    ctx.db.flush()
     _startup_sync(ctx)
+    ctx.db.flush()
     data_cfg = replace(config.ib, client_id=config.ib.client_id + 2)
     data_feed = MarketDataFeed(config, config.symbols, data_cfg)
     data_feed.start()
@@ -538,6 +596,7 @@ def run_loop(config: AppConfig, db: Database, broker: IBClient, risk: RiskManage
         try:
             if not us_market_is_open(config.timezone):
                 _mark_event(ctx, "INFO", "market closed, sleeping")
+                ctx.db.flush()
                 _sleep_interruptible(ctx, 5.0)
                 continue
 
@@ -555,6 +614,7 @@ def run_loop(config: AppConfig, db: Database, broker: IBClient, risk: RiskManage
                 warned_cap = True
 
             _ensure_day_start_equity(ctx, equity)
+            ctx.db.flush()
             positions = broker.get_positions()
             if data_feed is None:
                 for symbol in config.symbols:
@@ -567,6 +627,8 @@ def run_loop(config: AppConfig, db: Database, broker: IBClient, risk: RiskManage
                         bar_size=config.strategy.bar_size,
                     )
                     _execute_symbol(ctx, symbol, equity, positions, closes)
+                    # Commit before the next history request so the write lock is not held across it.
+                    ctx.db.flush()
             else:
                 symbol = data_feed.next_symbol(timeout_seconds=1.0)
                 if not symbol:
@@ -577,8 +639,16 @@ def run_loop(config: AppConfig, db: Database, broker: IBClient, risk: RiskManage
                 _execute_symbol(ctx, symbol, equity, positions, update.closes)
 
         except Exception as exc:  # noqa: BLE001
-            _mark_event(ctx, "ERROR", f"loop error: {exc}")
+            try:
+                _mark_event(ctx, "ERROR", f"loop error: {exc}")
+            except sqlite3.Error as db_exc:
+                # A locked database must not take the engine down with it.
+                _print_runtime_log("ERROR", f"loop error: {exc} (not stored: {db_exc})", config.timezone)
         finally:
+            try:
+                ctx.db.flush()
+            except sqlite3.Error as db_exc:
+                _print_runtime_log("WARN", f"database flush failed: {db_exc}", config.timezone)
             if not ctx.shutdown:
                 _sleep_interruptible(ctx, 0.2 if data_feed is not None else config.strategy.loop_interval_seconds)
 
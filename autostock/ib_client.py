@@ -1,7 +1,9 @@
 from __future__ import annotations
 
+import asyncio
 from dataclasses import dataclass
 from datetime import UTC, datetime
+from operator import attrgetter
 from typing import Iterable
 
 from ib_insync import IB, ExecutionFilter, MarketOrder, Stock
@@ -29,12 +31,16 @@ class ExecutionInfo:
     perm_id: int | None
 
 
+_EXECUTION_FIELDS = attrgetter("execId", "time", "acctNumber", "side", "shares", "price", "orderId", "permId")
+
+# Statuses TWS reports before it has accepted (or filled) an order.
+_UNACKED_ORDER_STATUSES = frozenset({"", "PendingSubmit", "ApiPending", "PreSubmitted"})
+
+
 def close_order_for_position(quantity: float) -> tuple[str, int]:
     if quantity == 0:
         raise ValueError("cannot close a zero position")
-    if quantity > 0:
-        return "SELL", int(abs(quantity))
-    return "BUY", int(abs(quantity))
+    return ("SELL", int(quantity)) if quantity > 0 else ("BUY", int(-quantity))
 
 
 def choose_account(preferred: str, managed_accounts: list[str]) -> str:
@@ -48,6 +54,13 @@ def choose_account(preferred: str, managed_accounts: list[str]) -> str:
     return managed_accounts[0]
 
 
+def usable_ticker_price(ticker) -> float | None:
+    for price in (ticker.marketPrice(), ticker.last, ticker.close):
+        if price is not None and price > 0:
+            return float(price)
+    return None
+
+
 def build_market_order(side: str, quantity: int) -> MarketOrder:
     if quantity <= 0:
         raise ValueError("quantity must be positive")
@@ -63,12 +76,14 @@ class IBClient:
         self.config = config
         self.ib = IB()
         self.account: str | None = None
+        self._qualified: dict[str, Stock] = {}
 
     def connect(self) -> None:
         self.ib.connect(self.config.host, self.config.port, clientId=self.config.client_id, timeout=10)
         self.account = self._select_account()
 
     def disconnect(self) -> None:
+        self._qualified.clear()
         if self.ib.isConnected():
             self.ib.disconnect()
 
@@ -95,6 +110,17 @@ class IBClient:
             raise RuntimeError("Unable to detect any available IB accounts after connection")
         return choose_account(preferred, managed_accounts)
 
+    def _contracts(self, symbols: Iterable[str]) -> list[Stock]:
+        # conIds are stable for the session, so each symbol is qualified once per connection.
+        symbols = list(symbols)
+        pending = {symbol: Stock(symbol, "SMART", "USD") for symbol in symbols if symbol not in self._qualified}
+        if pending:
+            self.ib.qualifyContracts(*pending.values())
+            for symbol, contract in pending.items():
+                if contract.conId:
+                    self._qualified[symbol] = contract
+        return [self._qualified.get(symbol) or pending[symbol] for symbol in symbols]
+
     def get_active_account(self) -> str:
         if not self.account:
             raise RuntimeError("IB account not selected; connect first")
@@ -114,28 +140,48 @@ class IBClient:
     def get_positions(self) -> dict[str, PositionInfo]:
         account = self.get_active_account()
         out: dict[str, PositionInfo] = {}
-        for pos in self.ib.positions():
-            if getattr(pos, "account", "") != account:
-                continue
+        # ib_insync keeps positions per account in sync with TWS; read just this account's table.
+        for pos in self.ib.positions(account):
             symbol = pos.contract.symbol
             out[symbol] = PositionInfo(symbol=symbol, quantity=float(pos.position), avg_cost=float(pos.avgCost))
         return out
 
     def get_last_price(self, symbol: str) -> float:
-        contract = Stock(symbol, "SMART", "USD")
-        self.ib.qualifyContracts(contract)
-        ticker = self.ib.reqMktData(contract, "", False, False)
-        self.ib.sleep(1.0)
-        price = ticker.marketPrice()
-        if price is None or price <= 0:
-            if ticker.last and ticker.last > 0:
-                price = ticker.last
-            elif ticker.close and ticker.close > 0:
-                price = ticker.close
-        self.ib.cancelMktData(contract)
-        if price is None or price <= 0:
+        price = self.get_last_prices([symbol]).get(symbol)
+        if price is None:
             raise RuntimeError(f"Unable to determine last price for {symbol}")
-        return float(price)
+        return price
+
+    def get_last_prices(self, symbols: Iterable[str], timeout: float = 2.0) -> dict[str, float]:
+        symbols = list(dict.fromkeys(symbols))
+        return self.ib.run(self._get_last_prices_async(symbols, self._contracts(symbols), timeout))
+
+    async def _get_last_prices_async(
+        self, symbols: list[str], contracts: list[Stock], timeout: float
+    ) -> dict[str, float]:
+        tickers = [self.ib.reqMktData(contract, "", False, False) for contract in contracts]
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        prices: dict[str, float] = {}
+        try:
+            # Wake on ticker updates instead of a fixed sleep; symbols still unpriced at the deadline are left out.
+            while True:
+                for symbol, ticker in zip(symbols, tickers):
+                    if symbol not in prices:
+                        price = usable_ticker_price(ticker)
+                        if price is not None:
+                            prices[symbol] = price
+                remaining = deadline - loop.time()
+                if len(prices) == len(symbols) or remaining <= 0:
+                    break
+                try:
+                    await asyncio.wait_for(self.ib.pendingTickersEvent, remaining)
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            for contract in contracts:
+                self.ib.cancelMktData(contract)
+        return prices
 
     def get_recent_closes(self, symbol: str, duration: str, bar_size: str) -> list[float]:
         return [row.close for row in self.get_historical_bars(symbol, duration, bar_size)]
@@ -147,8 +193,7 @@ class IBClient:
         bar_size: str,
         end_datetime: str = "",
     ) -> list["HistoricalBar"]:
-        contract = Stock(symbol, "SMART", "USD")
-        self.ib.qualifyContracts(contract)
+        (contract,) = self._contracts([symbol])
         bars = self.ib.reqHistoricalData(
             contract,
             endDateTime=end_datetime,
@@ -159,26 +204,51 @@ class IBClient:
             formatDate=1,
             keepUpToDate=False,
         )
-        out: list[HistoricalBar] = []
-        for bar in bars:
-            out.append(
-                HistoricalBar(
-                    date=str(bar.date),
-                    open=float(bar.open),
-                    high=float(bar.high),
-                    low=float(bar.low),
-                    close=float(bar.close),
-                    volume=float(bar.volume),
+        return _to_historical_bars(bars)
+
+    def get_historical_bars_bulk(
+        self,
+        requests: Iterable[tuple[str, str, str]],
+        max_concurrency: int = 4,
+        errors: dict[tuple[str, str, str], BaseException] | None = None,
+    ) -> dict[tuple[str, str, str], list["HistoricalBar"]]:
+        requests = list(dict.fromkeys(requests))
+        symbols = list(dict.fromkeys(symbol for symbol, _duration, _bar_size in requests))
+        contracts = dict(zip(symbols, self._contracts(symbols)))
+        semaphore = asyncio.Semaphore(max(1, max_concurrency))
+
+        async def _fetch(symbol: str, duration: str, bar_size: str):
+            async with semaphore:
+                return await self.ib.reqHistoricalDataAsync(
+                    contracts[symbol],
+                    endDateTime="",
+                    durationStr=duration,
+                    barSizeSetting=bar_size,
+                    whatToShow="TRADES",
+                    useRTH=True,
+                    formatDate=1,
+                    keepUpToDate=False,
                 )
-            )
+
+        async def _fetch_all():
+            return await asyncio.gather(*(_fetch(*request) for request in requests), return_exceptions=True)
+
+        # Failed requests map to [] so callers can retry them one by one; pass errors to see why they failed.
+        out: dict[tuple[str, str, str], list[HistoricalBar]] = {}
+        for request, bars in zip(requests, self.ib.run(_fetch_all())):
+            if isinstance(bars, BaseException):
+                out[request] = []
+                if errors is not None:
+                    errors[request] = bars
+            else:
+                out[request] = _to_historical_bars(bars)
         return out
 
     def submit_market_order(self, symbol: str, side: str, quantity: int) -> str:
-        contract = Stock(symbol, "SMART", "USD")
-        self.ib.qualifyContracts(contract)
+        (contract,) = self._contracts([symbol])
         order = build_market_order(side, quantity)
         trade = self.ib.placeOrder(contract, order)
-        self.ib.sleep(1.0)
+        self.ib.run(_wait_for_order_ack(trade, timeout=1.0))
         return str(trade.orderStatus.status)
 
     def close_position(self, symbol: str, quantity: float) -> str:
@@ -186,8 +256,7 @@ class IBClient:
         return self.submit_market_order(symbol, side, qty)
 
     def ensure_symbols(self, symbols: Iterable[str]) -> None:
-        contracts = [Stock(sym, "SMART", "USD") for sym in symbols]
-        self.ib.qualifyContracts(*contracts)
+        self._contracts(symbols)
 
     def get_executions_since(self, since_utc_iso: str | None = None) -> list[ExecutionInfo]:
         account = self.get_active_account()
@@ -202,28 +271,39 @@ class IBClient:
 
         out: list[ExecutionInfo] = []
         for fill in fills:
-            exec_ = fill.execution
-            contract = fill.contract
-            exec_time = exec_.time
+            exec_id, exec_time, acct, side, shares, price, order_id, perm_id = _EXECUTION_FIELDS(fill.execution)
             if exec_time.tzinfo is None:
                 exec_time = exec_time.replace(tzinfo=UTC)
-            ts_utc = exec_time.astimezone(UTC).isoformat()
             out.append(
                 ExecutionInfo(
-                    exec_id=str(exec_.execId),
-                    ts_utc=ts_utc,
-                    account=str(exec_.acctNumber),
-                    symbol=str(contract.symbol),
-                    side=str(exec_.side).upper(),
-                    quantity=float(exec_.shares),
-                    price=float(exec_.price),
-                    order_id=int(exec_.orderId) if exec_.orderId is not None else None,
-                    perm_id=int(exec_.permId) if exec_.permId is not None else None,
+                    exec_id=str(exec_id),
+                    ts_utc=exec_time.astimezone(UTC).isoformat(),
+                    account=str(acct),
+                    symbol=str(fill.contract.symbol),
+                    side=str(side).upper(),
+                    quantity=float(shares),
+                    price=float(price),
+                    order_id=int(order_id) if order_id is not None else None,
+                    perm_id=int(perm_id) if perm_id is not None else None,
                 )
             )
         return out
 
 
+async def _wait_for_order_ack(trade, timeout: float) -> None:
+    # Return on the first status update past the unacked states instead of sleeping out the full timeout.
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    while trade.orderStatus.status in _UNACKED_ORDER_STATUSES:
+        remaining = deadline - loop.time()
+        if remaining <= 0:
+            return
+        try:
+            await asyncio.wait_for(trade.statusEvent, remaining)
+        except asyncio.TimeoutError:
+            return
+
+
 @dataclass(slots=True)
 class HistoricalBar:
     date: str
@@ -232,3 +312,17 @@ class HistoricalBar:
     low: float
     close: float
     volume: float
+
+
+def _to_historical_bars(bars: Iterable) -> list[HistoricalBar]:
+    return [
+        HistoricalBar(
+            date=str(bar.date),
+            open=float(bar.open),
+            high=float(bar.high),
+            low=float(bar.low),
+            close=float(bar.close),
+            volume=float(bar.volume),
+        )
+        for bar in bars
+    ]
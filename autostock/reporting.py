@@ -20,25 +20,22 @@ def render_status(db: Database) -> str:
 
 
 def render_daily_report(db: Database) -> str:
+    # Counts and cash PnL are aggregated by SQLite; only the listed events are fetched.
     since = (datetime.now(timezone.utc) - timedelta(hours=24)).isoformat()
-    orders = db.orders_since(since)
-    events = db.events_since(since)
+    summary = db.orders_summary_since(since)
+    events = db.events_since(since, limit=10)
 
     lines = ["Last 24h report:"]
-    lines.append(f"Orders: {len(orders)}")
-    buy = sum(1 for o in orders if o["side"] == "BUY")
-    sell = sum(1 for o in orders if o["side"] == "SELL")
-    lines.append(f"BUY={buy}, SELL={sell}")
-
-    realized = 0.0
-    for o in orders:
-        if o["side"] == "SELL" and o["price"] is not None:
-            realized += float(o["price"]) * float(o["quantity"])
-        elif o["side"] == "BUY" and o["price"] is not None:
-            realized -= float(o["price"]) * float(o["quantity"])
-    lines.append(f"Approx cash PnL (fills basis): {realized:.2f}")
-
-    lines.append(f"Events: {len(events)}")
-    for evt in events[:10]:
+    lines.append(f"Orders: {summary['orders']}")
+    lines.append(f"BUY={int(summary['buy'])}, SELL={int(summary['sell'])}")
+    lines.append(f"Approx cash PnL (fills basis): {summary['cash_pnl']:.2f}")
+    by_symbol = db.cash_pnl_by_symbol_since(since)
+    if by_symbol:
+        lines.append("Top cash PnL by symbol:")
+        for symbol, cash_pnl in by_symbol:
+            lines.append(f"- {symbol}: {cash_pnl:.2f}")
+
+    lines.append(f"Events: {db.count_events_since(since)}")
+    for evt in events:
         lines.append(f"- [{evt['level']}] {evt['ts_utc']} {evt['message']}")
     return "\n".join(lines)
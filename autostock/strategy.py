@@ -2,6 +2,9 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 from enum import Enum
+from functools import lru_cache
+
+import numpy as np
 
 from autostock.config import RSIConfig, StrategyComboConfig, StrategyConfig
 
@@ -12,6 +15,11 @@ class Signal(str, Enum):
     HOLD = "HOLD"
 
 
+SIGNAL_BUY = 1
+SIGNAL_SELL = -1
+SIGNAL_HOLD = 0
+
+
 @dataclass(slots=True)
 class StrategyVote:
     name: str
@@ -20,40 +28,22 @@ class StrategyVote:
     reason: str
 
 
-def simple_moving_average(values: list[float], window: int) -> list[float]:
+def simple_moving_average(values: list[float] | np.ndarray, window: int) -> list[float]:
     if window <= 0:
         raise ValueError("window must be positive")
-    if len(values) < window:
+    prices = np.asarray(values, dtype=np.float64)
+    if prices.size < window:
         return []
-    out: list[float] = []
-    running = sum(values[:window])
-    out.append(running / window)
-    for i in range(window, len(values)):
-        running += values[i] - values[i - window]
-        out.append(running / window)
-    return out
+    return (_window_sums(prices, window) / window).tolist()
 
 
 def moving_average_crossover_signal(closes: list[float], short_window: int, long_window: int) -> Signal:
+    # Only the last two averages of each window are compared, so sum just those windows.
     if short_window >= long_window:
         raise ValueError("short_window must be smaller than long_window")
     if len(closes) < long_window + 2:
         return Signal.HOLD
-
-    short = simple_moving_average(closes, short_window)
-    long = simple_moving_average(closes, long_window)
-    aligned_short = short[-len(long) :]
-    if len(aligned_short) < 2 or len(long) < 2:
-        return Signal.HOLD
-
-    prev_short, curr_short = aligned_short[-2], aligned_short[-1]
-    prev_long, curr_long = long[-2], long[-1]
-
-    if prev_short <= prev_long and curr_short > curr_long:
-        return Signal.BUY
-    if prev_short >= prev_long and curr_short < curr_long:
-        return Signal.SELL
-    return Signal.HOLD
+    return moving_average_crossover_signal_at(closes, len(closes) - 1, short_window, long_window)
 
 
 def moving_average_crossover_signal_at(
@@ -86,29 +76,7 @@ def rsi_signal(closes: list[float], config: RSIConfig) -> Signal:
         raise ValueError("rsi window must be positive")
     if len(closes) < config.window + 1:
         return Signal.HOLD
-
-    gains = 0.0
-    losses = 0.0
-    for i in range(len(closes) - config.window, len(closes)):
-        change = closes[i] - closes[i - 1]
-        if change > 0:
-            gains += change
-        else:
-            losses += -change
-
-    avg_gain = gains / config.window
-    avg_loss = losses / config.window
-    if avg_loss == 0:
-        rsi = 100.0
-    else:
-        rs = avg_gain / avg_loss
-        rsi = 100.0 - (100.0 / (1.0 + rs))
-
-    if rsi <= config.oversold:
-        return Signal.BUY
-    if rsi >= config.overbought:
-        return Signal.SELL
-    return Signal.HOLD
+    return rsi_signal_at(closes, len(closes) - 1, config)
 
 
 def rsi_signal_at(closes: list[float], end_index: int, config: RSIConfig) -> Signal:
@@ -169,23 +137,30 @@ def combine_votes(votes: list[StrategyVote], combo_cfg: StrategyComboConfig) ->
 
     if mode == "priority":
         for vote in votes:
-            if vote.signal != Signal.HOLD:
+            if vote.signal is not Signal.HOLD:
                 return vote.signal, f"priority:{vote.name}"
         return Signal.HOLD, "priority:all_hold"
 
     if mode == "unanimous":
-        non_hold = [v.signal for v in votes if v.signal != Signal.HOLD]
-        if not non_hold:
-            return Signal.HOLD, "unanimous:all_hold"
-        if all(s == Signal.BUY for s in non_hold) and len(non_hold) == len(votes):
+        # Any two differing votes (including a HOLD next to a BUY/SELL) are a conflict.
+        first = votes[0].signal
+        for vote in votes:
+            if vote.signal is not first:
+                return Signal.HOLD, "unanimous:conflict"
+        if first is Signal.BUY:
             return Signal.BUY, "unanimous:buy"
-        if all(s == Signal.SELL for s in non_hold) and len(non_hold) == len(votes):
+        if first is Signal.SELL:
             return Signal.SELL, "unanimous:sell"
-        return Signal.HOLD, "unanimous:conflict"
+        return Signal.HOLD, "unanimous:all_hold"
 
     if mode == "vote":
-        buy_count = sum(1 for v in votes if v.signal == Signal.BUY)
-        sell_count = sum(1 for v in votes if v.signal == Signal.SELL)
+        buy_count = 0
+        sell_count = 0
+        for vote in votes:
+            if vote.signal is Signal.BUY:
+                buy_count += 1
+            elif vote.signal is Signal.SELL:
+                sell_count += 1
         if buy_count > sell_count:
             return Signal.BUY, f"vote:{buy_count}-{sell_count}"
         if sell_count > buy_count:
@@ -194,9 +169,9 @@ def combine_votes(votes: list[StrategyVote], combo_cfg: StrategyComboConfig) ->
 
     weighted_score = 0.0
     for vote in votes:
-        if vote.signal == Signal.BUY:
+        if vote.signal is Signal.BUY:
             weighted_score += vote.weight
-        elif vote.signal == Signal.SELL:
+        elif vote.signal is Signal.SELL:
             weighted_score -= vote.weight
 
     if weighted_score > threshold:
@@ -232,3 +207,141 @@ def evaluate_combined_signal_at(
     signal, decision_reason = combine_votes(votes, combo_cfg)
     detail = ",".join(f"{v.name}:{v.signal.value}:{v.weight}" for v in votes) or "none"
     return signal, f"{decision_reason}|{detail}"
+
+
+def _window_sums(values: np.ndarray, window: int) -> np.ndarray:
+    # Accumulate left to right so every window matches sum(values[a:b]) exactly.
+    count = values.size - window + 1
+    if count <= 0:
+        return np.empty(0, dtype=np.float64)
+    out = values[:count].copy()
+    for k in range(1, window):
+        out += values[k : k + count]
+    return out
+
+
+def moving_average_crossover_series(closes: np.ndarray, short_window: int, long_window: int) -> np.ndarray:
+    if short_window >= long_window:
+        raise ValueError("short_window must be smaller than long_window")
+    out = np.zeros(closes.size, dtype=np.int8)
+    first = long_window + 1
+    if closes.size <= first:
+        return out
+
+    end = np.arange(first, closes.size)
+    short_sums = _window_sums(closes, short_window)
+    long_sums = _window_sums(closes, long_window)
+    curr_short = short_sums[end - short_window + 1] / short_window
+    prev_short = short_sums[end - short_window] / short_window
+    curr_long = long_sums[end - long_window + 1] / long_window
+    prev_long = long_sums[end - long_window] / long_window
+
+    signals = out[first:]
+    signals[(prev_short >= prev_long) & (curr_short < curr_long)] = SIGNAL_SELL
+    signals[(prev_short <= prev_long) & (curr_short > curr_long)] = SIGNAL_BUY
+    return out
+
+
+def rsi_series(closes: np.ndarray, config: RSIConfig) -> np.ndarray:
+    if config.window <= 0:
+        raise ValueError("rsi window must be positive")
+    out = np.zeros(closes.size, dtype=np.int8)
+    if closes.size < config.window + 1:
+        return out
+
+    changes = np.diff(closes)
+    gains = _window_sums(np.where(changes > 0, changes, 0.0), config.window)
+    losses = _window_sums(np.where(changes > 0, 0.0, -changes), config.window)
+    avg_gain = gains / config.window
+    avg_loss = losses / config.window
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rsi = np.where(avg_loss == 0, 100.0, 100.0 - (100.0 / (1.0 + avg_gain / avg_loss)))
+
+    signals = out[config.window :]
+    signals[rsi >= config.overbought] = SIGNAL_SELL
+    signals[rsi <= config.oversold] = SIGNAL_BUY
+    return out
+
+
+def combine_vote_series(series: list[tuple[np.ndarray, float]], combo_cfg: StrategyComboConfig, size: int) -> np.ndarray:
+    out = np.zeros(size, dtype=np.int8)
+    if not series:
+        return out
+
+    mode = combo_cfg.combination_mode
+    threshold = combo_cfg.decision_threshold
+
+    if mode == "priority":
+        for codes, _weight_value in reversed(series):
+            out = np.where(codes != SIGNAL_HOLD, codes, out)
+        return out
+
+    if mode == "unanimous":
+        all_buy = np.ones(size, dtype=bool)
+        all_sell = np.ones(size, dtype=bool)
+        for codes, _weight_value in series:
+            all_buy &= codes == SIGNAL_BUY
+            all_sell &= codes == SIGNAL_SELL
+        out[all_buy] = SIGNAL_BUY
+        out[all_sell] = SIGNAL_SELL
+        return out
+
+    if mode == "vote":
+        buy_count = np.zeros(size, dtype=np.int64)
+        sell_count = np.zeros(size, dtype=np.int64)
+        for codes, _weight_value in series:
+            buy_count += codes == SIGNAL_BUY
+            sell_count += codes == SIGNAL_SELL
+        out[buy_count > sell_count] = SIGNAL_BUY
+        out[sell_count > buy_count] = SIGNAL_SELL
+        return out
+
+    weighted_score = np.zeros(size, dtype=np.float64)
+    for codes, weight in series:
+        weighted_score += np.where(codes == SIGNAL_BUY, weight, np.where(codes == SIGNAL_SELL, -weight, 0.0))
+    out[weighted_score > threshold] = SIGNAL_BUY
+    out[weighted_score < -threshold] = SIGNAL_SELL
+    return out
+
+
+# Grid sweeps re-evaluate the same closes with the same per-strategy parameters while
+# only the combination settings change, so per-strategy series are memoized on the raw
+# price bytes. Cached arrays are read-only; callers only combine them into new arrays.
+# Each entry pins a full close-price buffer, so the caches stay small (symbols x parameter sets).
+@lru_cache(maxsize=32)
+def _cached_ma_series(prices_key: bytes, short_window: int, long_window: int) -> np.ndarray:
+    codes = moving_average_crossover_series(np.frombuffer(prices_key, dtype=np.float64), short_window, long_window)
+    codes.setflags(write=False)
+    return codes
+
+
+@lru_cache(maxsize=32)
+def _cached_rsi_series(prices_key: bytes, window: int, oversold: float, overbought: float) -> np.ndarray:
+    config = RSIConfig(window=window, oversold=oversold, overbought=overbought)
+    codes = rsi_series(np.frombuffer(prices_key, dtype=np.float64), config)
+    codes.setflags(write=False)
+    return codes
+
+
+def clear_signal_series_cache() -> None:
+    _cached_ma_series.cache_clear()
+    _cached_rsi_series.cache_clear()
+
+
+def evaluate_combined_signal_series(
+    closes: list[float] | np.ndarray,
+    strategy_cfg: StrategyConfig,
+    combo_cfg: StrategyComboConfig,
+) -> np.ndarray:
+    prices = np.asarray(closes, dtype=np.float64)
+    prices_key = prices.tobytes()
+    rsi_cfg = combo_cfg.rsi
+    series: list[tuple[np.ndarray, float]] = []
+    for name in combo_cfg.enabled_strategies:
+        if name == "ma":
+            codes = _cached_ma_series(prices_key, strategy_cfg.short_window, strategy_cfg.long_window)
+            series.append((codes, _weight(combo_cfg, "ma")))
+        elif name == "rsi":
+            codes = _cached_rsi_series(prices_key, rsi_cfg.window, rsi_cfg.oversold, rsi_cfg.overbought)
+            series.append((codes, _weight(combo_cfg, "rsi")))
+    return combine_vote_series(series, combo_cfg, prices.size)
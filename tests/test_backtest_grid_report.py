@@ -1,14 +1,10 @@
 from __future__ import annotations
 
-from pathlib import Path
-
 from autostock.backtest_grid_report import write_leaderboard_html, write_trades_html
 
 
-def test_write_leaderboard_html_from_grid_summary_csv() -> None:
-    base_dir = Path("data") / "test_backtest_grid_report"
-    base_dir.mkdir(parents=True, exist_ok=True)
-    summary_path = base_dir / "grid_summary.csv"
+def test_write_leaderboard_html_from_grid_summary_csv(tmp_path) -> None:
+    summary_path = tmp_path / "grid_summary.csv"
     summary_path.write_text(
         "\n".join(
             [
@@ -19,7 +15,7 @@ def test_write_leaderboard_html_from_grid_summary_csv() -> None:
         ),
         encoding="utf-8",
     )
-    output_path = base_dir / "leaderboard.html"
+    output_path = tmp_path / "leaderboard.html"
     out = write_leaderboard_html(summary_path, output_path)
     assert out == output_path
     html = output_path.read_text(encoding="utf-8")
@@ -28,15 +24,13 @@ def test_write_leaderboard_html_from_grid_summary_csv() -> None:
     assert ">Scenario<" in html
     assert "<h2>5min</h2>" in html
     assert "<h2>1d</h2>" in html
-    assert "data/test_backtest_grid_report/grid_summary.csv" in html.replace("\\", "/")
+    assert summary_path.as_posix() in html.replace("\\", "/")
     assert "strategy.short_window=20" in html
     assert "sortTable" in html
 
 
-def test_write_trades_html_from_trades_csv() -> None:
-    base_dir = Path("data") / "test_backtest_grid_report"
-    base_dir.mkdir(parents=True, exist_ok=True)
-    trades_path = base_dir / "run_001__1d__trades.csv"
+def test_write_trades_html_from_trades_csv(tmp_path) -> None:
+    trades_path = tmp_path / "run_001__1d__trades.csv"
     trades_path.write_text(
         "\n".join(
             [
@@ -47,7 +41,7 @@ def test_write_trades_html_from_trades_csv() -> None:
         ),
         encoding="utf-8",
     )
-    output_path = base_dir / "run_001__1d__trades.html"
+    output_path = tmp_path / "run_001__1d__trades.html"
     out = write_trades_html(trades_path, output_path)
     assert out == output_path
     html = output_path.read_text(encoding="utf-8")
@@ -2,10 +2,18 @@ from __future__ import annotations
 
 from pathlib import Path
 
+import pytest
+
 from autostock.backtest import fetch_historical_bars_with_auto_split
 from autostock.ib_client import HistoricalBar
 
 
+@pytest.fixture(autouse=True)
+def _isolated_cache_dir(tmp_path, monkeypatch) -> None:
+    # The auto-split tests use the default ./data cache dir; keep that out of the checkout.
+    monkeypatch.chdir(tmp_path)
+
+
 class _FakeBroker:
     def __init__(self, direct: list[HistoricalBar], chunk_batches: list[list[HistoricalBar]], fail_direct: bool = False) -> None:
         self.direct = direct
@@ -92,9 +100,8 @@ def test_auto_split_falls_back_to_chunk_on_direct_failure() -> None:
     assert any(call[3] != "" for call in broker.calls[1:])
 
 
-def test_backtest_history_cache_reuses_recent_data() -> None:
-    cache_dir = Path("data") / "test_backtest_cache"
-    cache_dir.mkdir(parents=True, exist_ok=True)
+def test_backtest_history_cache_reuses_recent_data(tmp_path) -> None:
+    cache_dir = tmp_path
     first_broker = _FakeBroker(direct=[_bar("2026-01-01 09:30:00", 100.0)], chunk_batches=[])
     first = fetch_historical_bars_with_auto_split(
         broker=first_broker,
@@ -122,3 +129,85 @@ def test_backtest_history_cache_reuses_recent_data() -> None:
     )
     assert len(second) == 1
     assert len(second_broker.calls) == 0
+
+
+def test_backtest_history_cache_hit_reuses_parsed_bars_in_process(monkeypatch, tmp_path) -> None:
+    import autostock.backtest as bt
+
+    cache_dir = tmp_path
+    kwargs = dict(
+        symbol="MEMO",
+        duration="10 D",
+        bar_size="1 day",
+        max_bars_per_request=10000,
+        cache_ttl_hours=24.0,
+        cache_dir=cache_dir,
+    )
+    fetch_historical_bars_with_auto_split(
+        broker=_FakeBroker(direct=[_bar("2026-01-01 09:30:00", 100.0)], chunk_batches=[]),
+        refresh_cache=True,
+        **kwargs,
+    )
+    first = fetch_historical_bars_with_auto_split(broker=_FakeBroker([], []), refresh_cache=False, **kwargs)
+
+    def _fail(path: Path) -> list[HistoricalBar]:
+        raise AssertionError("cache file should not be parsed again")
+
+    monkeypatch.setattr(bt, "_load_cached_bars", _fail)
+    first.clear()
+    second = fetch_historical_bars_with_auto_split(broker=_FakeBroker([], []), refresh_cache=False, **kwargs)
+    assert second is not first
+    assert [b.close for b in second] == [100.0]
+
+
+def test_backtest_history_cache_memo_is_lru_capped(monkeypatch, tmp_path) -> None:
+    import autostock.backtest as bt
+
+    cache_dir = tmp_path
+    monkeypatch.setattr(bt, "_CACHED_BARS_MEMO", bt.OrderedDict())
+    monkeypatch.setattr(bt, "_CACHED_BARS_MEMO_MAX", 1)
+    for symbol in ("MEMOA", "MEMOB"):
+        fetch_historical_bars_with_auto_split(
+            broker=_FakeBroker(direct=[_bar("2026-01-01 09:30:00", 100.0)], chunk_batches=[]),
+            symbol=symbol,
+            duration="10 D",
+            bar_size="1 day",
+            cache_ttl_hours=24.0,
+            refresh_cache=True,
+            cache_dir=cache_dir,
+        )
+        fetch_historical_bars_with_auto_split(
+            broker=_FakeBroker([], []),
+            symbol=symbol,
+            duration="10 D",
+            bar_size="1 day",
+            cache_ttl_hours=24.0,
+            refresh_cache=False,
+            cache_dir=cache_dir,
+        )
+    assert [path.name for path in bt._CACHED_BARS_MEMO] == ["MEMOB__1_day__10_d.json"]
+
+
+def test_backtest_history_cache_reads_legacy_row_layout(tmp_path) -> None:
+    import json
+
+    from autostock.backtest import _cache_file
+
+    cache_dir = tmp_path
+    path = _cache_file(cache_dir, "LEGACY", "10 D", "1 day")
+    path.parent.mkdir(parents=True, exist_ok=True)
+    rows = [
+        {"date": "2026-01-02", "open": 2.0, "high": 2.0, "low": 2.0, "close": 2.0, "volume": 10.0},
+        {"date": "2026-01-01", "open": 1.0, "high": 1.0, "low": 1.0, "close": 1.0, "volume": 10.0},
+    ]
+    path.write_text(json.dumps({"symbol": "LEGACY", "bars": rows}), encoding="utf-8")
+
+    bars = fetch_historical_bars_with_auto_split(
+        broker=_FakeBroker(direct=[], chunk_batches=[]),
+        symbol="LEGACY",
+        duration="10 D",
+        bar_size="1 day",
+        cache_ttl_hours=24.0,
+        cache_dir=cache_dir,
+    )
+    assert [(b.date, b.close) for b in bars] == [("2026-01-01", 1.0), ("2026-01-02", 2.0)]
@@ -1,5 +1,11 @@
 from __future__ import annotations
 
+import csv
+from dataclasses import replace
+
+import numpy as np
+import pytest
+
 from autostock import backtest as bt
 from autostock.config import (
     AppConfig,
@@ -12,7 +18,13 @@ from autostock.config import (
     StrategyConfig,
 )
 from autostock.ib_client import HistoricalBar
-from autostock.strategy import Signal
+from autostock.strategy import SIGNAL_BUY
+
+
+@pytest.fixture(autouse=True)
+def _isolated_cache_dir(tmp_path, monkeypatch) -> None:
+    # run_backtest writes its history cache under ./data; keep that out of the checkout.
+    monkeypatch.chdir(tmp_path)
 
 
 class _FakeBroker:
@@ -30,6 +42,32 @@ class _FakeBroker:
         return list(self._bars_by_symbol.get(symbol, []))
 
 
+class _FakeBatchBroker(_FakeBroker):
+    def __init__(self, bars_by_symbol: dict[str, list[HistoricalBar]]) -> None:
+        super().__init__(bars_by_symbol)
+        self.batch_calls: list[list[str]] = []
+        self.single_calls: list[str] = []
+
+    def get_historical_bars(
+        self,
+        symbol: str,
+        duration: str,
+        bar_size: str,
+        end_datetime: str = "",
+    ) -> list[HistoricalBar]:
+        self.single_calls.append(symbol)
+        return super().get_historical_bars(symbol, duration, bar_size, end_datetime)
+
+    def get_historical_bars_bulk(
+        self,
+        requests: list[tuple[str, str, str]],
+        max_concurrency: int = 4,
+    ) -> dict[tuple[str, str, str], list[HistoricalBar]]:
+        del max_concurrency
+        self.batch_calls.append([symbol for symbol, _duration, _bar_size in requests])
+        return {request: list(self._bars_by_symbol.get(request[0], [])) for request in requests}
+
+
 def _build_config(mode: str) -> AppConfig:
     return AppConfig(
         symbols=["AAA", "BBB"],
@@ -79,20 +117,19 @@ def _bars() -> list[HistoricalBar]:
     ]
 
 
-def _fake_eval_at(
+def _fake_signal_series(
     closes: list[float],
-    end_index: int,
     strategy_cfg: StrategyConfig,
     combo_cfg: StrategyComboConfig,
-) -> tuple[Signal, str]:
-    del closes, strategy_cfg, combo_cfg
-    if end_index == 1:
-        return Signal.BUY, "test-buy"
-    return Signal.HOLD, "test-hold"
+) -> np.ndarray:
+    del strategy_cfg, combo_cfg
+    out = np.zeros(len(closes), dtype=np.int8)
+    out[1] = SIGNAL_BUY
+    return out
 
 
 def test_backtest_portfolio_mode_uses_shared_cash_pool(monkeypatch) -> None:
-    monkeypatch.setattr(bt, "evaluate_combined_signal_at", _fake_eval_at)
+    monkeypatch.setattr(bt, "evaluate_combined_signal_series", _fake_signal_series)
     config = _build_config(mode="portfolio")
     broker = _FakeBroker({"AAA": _bars(), "BBB": _bars()})
     results = bt.run_backtest(config, broker, initial_capital=100.0, mode="portfolio")
@@ -103,8 +140,28 @@ def test_backtest_portfolio_mode_uses_shared_cash_pool(monkeypatch) -> None:
     assert sum(r.trades for r in results) == 1
 
 
+def test_portfolio_event_sort_reuses_parsed_bar_dates(monkeypatch) -> None:
+    monkeypatch.setattr(bt, "evaluate_combined_signal_series", _fake_signal_series)
+    config = _build_config(mode="portfolio")
+    broker = _FakeBroker({"SORT_A": _bars(), "SORT_B": _bars()})
+    bt._parse_bar_datetime.cache_clear()
+    bt.run_backtest(
+        config,
+        broker,
+        initial_capital=100.0,
+        duration="10 D",
+        bar_size="1 day",
+        symbols=["SORT_A", "SORT_B"],
+        mode="portfolio",
+        refresh_cache=True,
+    )
+    # Both symbols share the same bar dates, so the second symbol's events hit the cache.
+    assert bt._parse_bar_datetime.cache_info().hits >= 4
+    assert bt._parse_bar_datetime("20260101 09:30:00") == bt._parse_bar_datetime(" 2026-01-01 09:30:00 ")
+
+
 def test_backtest_per_symbol_mode_keeps_independent_cash(monkeypatch) -> None:
-    monkeypatch.setattr(bt, "evaluate_combined_signal_at", _fake_eval_at)
+    monkeypatch.setattr(bt, "evaluate_combined_signal_series", _fake_signal_series)
     config = _build_config(mode="per-symbol")
     broker = _FakeBroker({"AAA": _bars(), "BBB": _bars()})
     results = bt.run_backtest(config, broker, initial_capital=100.0, mode="per-symbol")
@@ -113,3 +170,154 @@ def test_backtest_per_symbol_mode_keeps_independent_cash(monkeypatch) -> None:
     assert by_symbol["AAA"].trades == 1
     assert by_symbol["BBB"].trades == 1
     assert sum(r.trades for r in results) == 2
+
+
+def test_backtest_per_symbol_mode_worker_pool_matches_serial() -> None:
+    closes = [3.0, 2.0, 1.0, 2.0, 3.0, 2.0, 1.0, 2.0, 3.0]
+    bars = [
+        HistoricalBar(date=f"2026-01-01 09:{30 + 5 * i:02d}:00", open=c, high=c, low=c, close=c, volume=1000)
+        for i, c in enumerate(closes)
+    ]
+    symbols = ["POOL_A", "POOL_B"]
+    broker = _FakeBroker({symbol: bars for symbol in symbols})
+    config = _build_config(mode="per-symbol")
+    serial = bt.run_backtest(config, broker, initial_capital=100.0, symbols=symbols, mode="per-symbol", refresh_cache=True)
+    pooled_config = replace(config, backtest=replace(config.backtest, workers=2))
+    pooled = bt.run_backtest(
+        pooled_config, broker, initial_capital=100.0, symbols=symbols, mode="per-symbol", refresh_cache=True
+    )
+
+    assert [r.symbol for r in pooled] == symbols
+    assert serial[0].trades > 0
+    assert pooled == serial
+
+    pool = bt._pool
+    again = bt.run_backtest(pooled_config, broker, initial_capital=100.0, symbols=symbols, mode="per-symbol")
+    assert bt._pool is pool
+    assert again == serial
+    bt.shutdown_simulation_pool()
+    assert bt._pool is None
+
+
+def test_export_backtest_trades_matches_csv_writer_quoting(tmp_path) -> None:
+    trade = bt.BacktestTrade(
+        symbol="BRK,B",
+        entry_time="2026-01-01",
+        exit_time='2026-01-02 "close"',
+        entry_price=10.0,
+        exit_price=12.5,
+        shares=3,
+        pnl=7.5,
+        return_pct=0.25,
+        exit_reason="STRATEGY_SELL",
+    )
+    result = bt.BacktestResult(
+        symbol="BRK,B",
+        bars=10,
+        trades=1,
+        wins=1,
+        losses=0,
+        pnl=7.5,
+        return_pct=0.075,
+        max_drawdown_pct=0.0,
+        trades_detail=(trade,),
+    )
+    path = tmp_path / "trades.csv"
+    bt.export_backtest_trades([result], str(path), initial_capital=100.0)
+
+    with path.open(newline="", encoding="utf-8") as f:
+        rows = list(csv.reader(f))
+    assert rows[0][0] == "symbol"
+    assert rows[1] == [
+        "BRK,B",
+        "2026-01-01",
+        '2026-01-02 "close"',
+        "10.000000",
+        "12.500000",
+        "3",
+        "30.00",
+        "37.50",
+        "7.50",
+        "0.250000",
+        "7.50",
+        "0.075000",
+        "107.50",
+        "STRATEGY_SELL",
+    ]
+
+
+def test_backtest_fetches_uncached_symbols_in_one_batch(monkeypatch) -> None:
+    monkeypatch.setattr(bt, "evaluate_combined_signal_series", _fake_signal_series)
+    symbols = ["BATCH_A", "BATCH_B", "BATCH_EMPTY"]
+    bars_by_symbol = {"BATCH_A": _bars(), "BATCH_B": _bars()}
+    config = _build_config(mode="portfolio")
+    batch_broker = _FakeBatchBroker(bars_by_symbol)
+    kwargs = dict(initial_capital=100.0, duration="10 D", bar_size="1 day", symbols=symbols, refresh_cache=True)
+    batched = bt.run_backtest(config, batch_broker, **kwargs)
+
+    assert batch_broker.batch_calls == [symbols]
+    # Symbols the batch could not fill fall back to the per-symbol fetch path.
+    assert batch_broker.single_calls == ["BATCH_EMPTY"]
+    serial = bt.run_backtest(config, _FakeBroker(bars_by_symbol), **kwargs)
+    assert batched == serial
+
+
+def test_prefetch_backtest_history_batches_scenarios_for_run_backtest(monkeypatch) -> None:
+    monkeypatch.setattr(bt, "evaluate_combined_signal_series", _fake_signal_series)
+    symbols = ["PRE_A", "PRE_B"]
+    config = _build_config(mode="per-symbol")
+    broker = _FakeBatchBroker({symbol: _bars() for symbol in symbols})
+    scenarios = [("10 D", "1 day"), ("20 D", "1 day")]
+    prefetched = bt.prefetch_backtest_history(config, broker, symbols, scenarios, refresh_cache=True)
+
+    assert broker.batch_calls == [symbols * 2]
+    for duration, bar_size in scenarios:
+        bt.run_backtest(
+            config,
+            broker,
+            initial_capital=100.0,
+            duration=duration,
+            bar_size=bar_size,
+            symbols=symbols,
+            mode="per-symbol",
+            refresh_cache=True,
+            prefetched=prefetched,
+        )
+    assert len(broker.batch_calls) == 1
+    assert broker.single_calls == []
+
+
+def test_backtest_log_level_from_config_silences_trade_logs(monkeypatch, capsys) -> None:
+    monkeypatch.setattr(bt, "evaluate_combined_signal_series", _fake_signal_series)
+    monkeypatch.delenv("AUTOSTOCK_LOG_LEVEL", raising=False)
+    broker = _FakeBroker({"QUIET": _bars()})
+    quiet_config = replace(_build_config(mode="per-symbol"), log_level="WARN")
+    results = bt.run_backtest(quiet_config, broker, initial_capital=100.0, symbols=["QUIET"], mode="per-symbol")
+    assert results[0].trades == 1
+    assert capsys.readouterr().out == ""
+
+    bt.run_backtest(_build_config(mode="per-symbol"), broker, initial_capital=100.0, symbols=["QUIET"], mode="per-symbol")
+    assert "QUIET: BUY" in capsys.readouterr().out
+
+
+def test_bar_columns_from_bars_keeps_dates_and_closes() -> None:
+    bars = [
+        HistoricalBar(date="2026-01-02", open=1.0, high=2.0, low=0.5, close=1.5, volume=10.0),
+        HistoricalBar(date="2026-01-03", open=1.5, high=2.5, low=1.0, close=2.25, volume=12.0),
+    ]
+    columns = bt.BarColumns.from_bars(bars)
+    assert len(columns) == 2
+    assert columns.dates == ["2026-01-02", "2026-01-03"]
+    assert columns.closes.dtype == np.float64
+    assert columns.closes.tolist() == [1.5, 2.25]
+
+
+def test_drawdown_tracker_matches_full_curve_drawdown() -> None:
+    rng = np.random.default_rng(7)
+    equity = 1000.0 + np.cumsum(rng.normal(0.0, 5.0, size=500))
+    tracker = bt._DrawdownTracker(peak=1000.0, trough=1000.0)
+    for value in equity.tolist():
+        tracker.push(value)
+    curve = np.concatenate(([1000.0], equity))
+    peaks = np.maximum.accumulate(curve)
+    assert tracker.result() == float(((peaks - curve) / peaks).max())
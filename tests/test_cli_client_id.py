@@ -1,4 +1,5 @@
-from autostock.cli import _safe_filename_token, flatten_uses_sidecar, select_client_id
+from autostock.cli import _build_parser, _safe_filename_token, _with_workers, flatten_uses_sidecar, select_client_id
+from autostock.config import load_default_config
 
 
 def test_select_client_id_for_run() -> None:
@@ -19,3 +20,10 @@ def test_flatten_force_uses_sidecar() -> None:
 
 def test_safe_filename_token_normalizes_text() -> None:
     assert _safe_filename_token("1 day / scenario") == "1_day_scenario"
+
+
+def test_backtest_workers_flag_overrides_config() -> None:
+    args = _build_parser().parse_args(["backtest", "--mode", "per-symbol", "--workers", "4"])
+    config = load_default_config()
+    assert _with_workers(config, args.workers).backtest.workers == 4
+    assert _with_workers(config, None) is config
@@ -1,7 +1,6 @@
 from __future__ import annotations
 
-from pathlib import Path
-
+from autostock import config as cfgmod
 from autostock.config import load_config
 
 
@@ -28,9 +27,8 @@ ib:
 """
 
 
-def test_capital_defaults_to_10000_when_missing() -> None:
-    path = Path("data/test_config_capital_default.yaml")
-    path.parent.mkdir(parents=True, exist_ok=True)
+def test_capital_defaults_to_10000_when_missing(tmp_path) -> None:
+    path = tmp_path / "test_config_capital_default.yaml"
     path.write_text(_base_yaml(), encoding="utf-8")
     cfg = load_config(path)
     assert cfg.capital.max_deploy_usd == 10000.0
@@ -39,17 +37,15 @@ def test_capital_defaults_to_10000_when_missing() -> None:
     assert cfg.strategy.cache_max_bars == 10000
 
 
-def test_capital_uses_explicit_value() -> None:
-    path = Path("data/test_config_capital_explicit.yaml")
-    path.parent.mkdir(parents=True, exist_ok=True)
+def test_capital_uses_explicit_value(tmp_path) -> None:
+    path = tmp_path / "test_config_capital_explicit.yaml"
     path.write_text(_base_yaml() + "\ncapital:\n  max_deploy_usd: 5000\n", encoding="utf-8")
     cfg = load_config(path)
     assert cfg.capital.max_deploy_usd == 5000.0
 
 
-def test_strategy_cache_fields_use_explicit_values() -> None:
-    path = Path("data/test_config_strategy_cache_fields.yaml")
-    path.parent.mkdir(parents=True, exist_ok=True)
+def test_strategy_cache_fields_use_explicit_values(tmp_path) -> None:
+    path = tmp_path / "test_config_strategy_cache_fields.yaml"
     path.write_text(
         _base_yaml()
         + "\nstrategy:\n  short_window: 20\n  long_window: 50\n  bar_size: 5 mins\n  duration: 60 D\n  loop_interval_seconds: 60\n  incremental_duration: 2 D\n  cache_max_bars: 6000\n",
@@ -60,9 +56,8 @@ def test_strategy_cache_fields_use_explicit_values() -> None:
     assert cfg.strategy.cache_max_bars == 6000
 
 
-def test_strategy_data_poll_seconds_uses_explicit_positive_value() -> None:
-    path = Path("data/test_config_strategy_data_poll.yaml")
-    path.parent.mkdir(parents=True, exist_ok=True)
+def test_strategy_data_poll_seconds_uses_explicit_positive_value(tmp_path) -> None:
+    path = tmp_path / "test_config_strategy_data_poll.yaml"
     path.write_text(
         _base_yaml()
         + "\nstrategy:\n  short_window: 20\n  long_window: 50\n  bar_size: 5 mins\n  duration: 60 D\n  loop_interval_seconds: 60\n  data_poll_seconds: 240\n",
@@ -70,3 +65,16 @@ def test_strategy_data_poll_seconds_uses_explicit_positive_value() -> None:
     )
     cfg = load_config(path)
     assert cfg.strategy.data_poll_seconds == 240
+
+
+def test_config_yaml_parse_is_cached_until_file_changes(tmp_path) -> None:
+    path = tmp_path / "test_config_parse_cache.yaml"
+    path.write_text(_base_yaml(), encoding="utf-8")
+    cfgmod._parse_yaml_file.cache_clear()
+    load_config(path)
+    load_config(path)
+    assert cfgmod._parse_yaml_file.cache_info().hits == 1
+
+    path.write_text(_base_yaml() + "\ncapital:\n  max_deploy_usd: 7500\n", encoding="utf-8")
+    cfg = load_config(path)
+    assert cfg.capital.max_deploy_usd == 7500.0
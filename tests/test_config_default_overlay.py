@@ -1,14 +1,11 @@
 from __future__ import annotations
 
-from pathlib import Path
-
 import autostock.config as cfgmod
 
 
-def test_load_default_config_uses_local_overlay(monkeypatch) -> None:
-    base_path = Path("data/test_default_base.yaml")
-    local_path = Path("data/test_default_local.yaml")
-    base_path.parent.mkdir(parents=True, exist_ok=True)
+def test_load_default_config_uses_local_overlay(tmp_path, monkeypatch) -> None:
+    base_path = tmp_path / "test_default_base.yaml"
+    local_path = tmp_path / "test_default_local.yaml"
 
     base_path.write_text(
         """\
@@ -49,9 +46,8 @@ capital:
     assert cfg.capital.max_deploy_usd == 7777.0
 
 
-def test_load_default_config_without_local(monkeypatch) -> None:
-    base_path = Path("data/test_default_base_only.yaml")
-    base_path.parent.mkdir(parents=True, exist_ok=True)
+def test_load_default_config_without_local(tmp_path, monkeypatch) -> None:
+    base_path = tmp_path / "test_default_base_only.yaml"
     base_path.write_text(
         """\
 symbols: [SPY]
@@ -76,6 +72,18 @@ ib:
         encoding="utf-8",
     )
     monkeypatch.setattr(cfgmod, "DEFAULT_BASE_CONFIG", str(base_path))
-    monkeypatch.setattr(cfgmod, "DEFAULT_LOCAL_CONFIG", "data/definitely_missing_local.yaml")
+    monkeypatch.setattr(cfgmod, "DEFAULT_LOCAL_CONFIG", str(tmp_path / "definitely_missing_local.yaml"))
     cfg = cfgmod.load_default_config()
     assert cfg.symbols == ["SPY"]
+
+
+def test_deep_merge_keeps_base_sections_without_mutating_inputs() -> None:
+    base = {"risk": {"stop_loss_pct": 0.08, "max_open_positions": 10}, "strategy": {"short_window": 20}}
+    override = {"risk": {"stop_loss_pct": 0.05}, "strategy": {}, "log_level": "DEBUG"}
+    merged = cfgmod._deep_merge(base, override)
+    assert merged == {
+        "risk": {"stop_loss_pct": 0.05, "max_open_positions": 10},
+        "strategy": {"short_window": 20},
+        "log_level": "DEBUG",
+    }
+    assert base["risk"] == {"stop_loss_pct": 0.08, "max_open_positions": 10}
@@ -55,3 +55,77 @@ def test_rebuild_daily_risk_state_tracks_symbol_pnl_and_loss_streak() -> None:
         assert consecutive_losses == 0
     finally:
         db.close()
+
+
+def test_writes_become_visible_to_other_connections_on_flush(tmp_path) -> None:
+    db_path = str(tmp_path / "flush.db")
+    db = Database(db_path)
+    reader = Database(db_path)
+    try:
+        db.log_event("info", "first")
+        assert reader.events_since("1970-01-01") == []
+        db.flush()
+        assert [row["message"] for row in reader.events_since("1970-01-01")] == ["first"]
+    finally:
+        reader.close()
+        db.close()
+
+
+def test_rebuild_daily_risk_state_handles_non_utc_timestamps() -> None:
+    db = Database(":memory:")
+    try:
+        now = datetime.now(timezone.utc)
+        db.upsert_execution("b1", (now - timedelta(days=3)).isoformat(), "DU1", "BBB", "BOT", 4, 50.0, 1, 1)
+        # Same instant as `now`, stored with a non-UTC offset.
+        local_ts = now.astimezone(timezone(timedelta(hours=-5))).isoformat()
+        db.upsert_execution("s1", local_ts, "DU1", "BBB", "SLD", 4, 45.0, 2, 2)
+
+        pnl_by_symbol, consecutive_losses = db.rebuild_daily_risk_state("UTC")
+        assert round(pnl_by_symbol["BBB"], 2) == -20.0
+        assert consecutive_losses == 1
+    finally:
+        db.close()
+
+
+def test_latest_snapshots_returns_one_row_per_symbol() -> None:
+    db = Database(":memory:")
+    try:
+        ts = "2026-01-05T15:00:00+00:00"
+        for symbol, position in [("BBB", 1.0), ("AAA", 3.0), ("BBB", 2.0)]:
+            db.conn.execute(
+                "INSERT INTO snapshots (ts_utc, symbol, position, avg_cost, last_price, unrealized_pnl) "
+                "VALUES (?, ?, ?, 0, 0, 0)",
+                (ts, symbol, position),
+            )
+        rows = db.latest_snapshots()
+        assert [(row["symbol"], row["position"]) for row in rows] == [("AAA", 3.0), ("BBB", 2.0)]
+    finally:
+        db.close()
+
+
+def test_schema_script_runs_once_per_database_file(tmp_path) -> None:
+    path = tmp_path / "schema_version.db"
+    with Database(str(path)) as db:
+        db.log_event("info", "kept")
+        version = db.conn.execute("PRAGMA user_version").fetchone()[0]
+        assert version >= 1
+    with Database(str(path)) as db:
+        assert [row["message"] for row in db.events_since("1970-01-01")] == ["kept"]
+        assert db.conn.execute("PRAGMA user_version").fetchone()[0] == version
+
+
+def test_upsert_executions_inserts_and_updates_in_one_call() -> None:
+    db = Database(":memory:")
+    try:
+        db.upsert_execution("e1", "2026-01-07T15:00:00+00:00", "DU1", "MSFT", "BOT", 10.0, 100.0, 1, 11)
+        db.upsert_executions(
+            [
+                ("e1", "2026-01-07T15:00:00+00:00", "DU1", "MSFT", "BOT", 10.0, 101.0, 1, 11),
+                ("e2", "2026-01-07T15:05:00+00:00", "DU1", "MSFT", "SLD", 10.0, 102.0, 2, 12),
+            ]
+        )
+        rows = db.conn.execute("SELECT exec_id, price FROM executions ORDER BY exec_id").fetchall()
+        assert [tuple(row) for row in rows] == [("e1", 101.0), ("e2", 102.0)]
+        assert db.latest_execution_ts() == "2026-01-07T15:05:00+00:00"
+    finally:
+        db.close()
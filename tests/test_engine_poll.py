@@ -1,9 +1,22 @@
 from __future__ import annotations
 
-from pathlib import Path
+import sqlite3
 
 from autostock.config import load_config
-from autostock.engine import _data_poll_seconds
+from autostock.database import Database
+from autostock.ib_client import HistoricalBar, PositionInfo
+from autostock.engine import (
+    EngineContext,
+    MarketDataFeed,
+    _add_symbol_realized_pnl,
+    _data_poll_seconds,
+    _engine_log_level,
+    _ensure_day_start_equity,
+    _execute_symbol,
+    _mark_event,
+    _symbol_realized_pnl_today,
+)
+from autostock.risk import RiskManager
 
 
 def _yaml_for_strategy(extra_strategy: str = "") -> str:
@@ -34,18 +47,145 @@ ib:
     )
 
 
-def test_data_poll_seconds_auto_uses_half_bar_size() -> None:
-    path = Path("data/test_engine_poll_auto.yaml")
-    path.parent.mkdir(parents=True, exist_ok=True)
+def test_data_poll_seconds_auto_uses_half_bar_size(tmp_path) -> None:
+    path = tmp_path / "engine_poll_auto.yaml"
     path.write_text(_yaml_for_strategy(), encoding="utf-8")
     cfg = load_config(path)
     assert _data_poll_seconds(cfg) == 300
 
 
-def test_data_poll_seconds_prefers_explicit_override() -> None:
-    path = Path("data/test_engine_poll_explicit.yaml")
-    path.parent.mkdir(parents=True, exist_ok=True)
+def test_data_poll_seconds_prefers_explicit_override(tmp_path) -> None:
+    path = tmp_path / "engine_poll_explicit.yaml"
     path.write_text(_yaml_for_strategy("  data_poll_seconds: 420\n"), encoding="utf-8")
     cfg = load_config(path)
     assert _data_poll_seconds(cfg) == 420
 
+
+class _CountingDatabase(Database):
+    def __init__(self) -> None:
+        super().__init__(":memory:")
+        self.reads = 0
+
+    def get_state(self, key, default=None):
+        self.reads += 1
+        return super().get_state(key, default)
+
+
+def test_engine_day_state_reads_hit_the_cache_after_first_lookup(tmp_path) -> None:
+    path = tmp_path / "engine_state_cache.yaml"
+    path.write_text(_yaml_for_strategy(), encoding="utf-8")
+    db = _CountingDatabase()
+    ctx = EngineContext(config=load_config(path), db=db, broker=None, risk=None)
+    try:
+        assert _ensure_day_start_equity(ctx, 1000.0) == 1000.0
+        assert _ensure_day_start_equity(ctx, 900.0) == 1000.0
+        _add_symbol_realized_pnl(ctx, "MSFT", -5.0)
+        assert _symbol_realized_pnl_today(ctx, "MSFT") == -5.0
+        assert db.reads == 2
+        fresh = EngineContext(config=ctx.config, db=db, broker=None, risk=None)
+        assert _symbol_realized_pnl_today(fresh, "MSFT") == -5.0
+    finally:
+        db.close()
+
+
+def test_us_market_is_open_reuses_answer_within_a_minute(monkeypatch) -> None:
+    import autostock.engine as engine
+
+    # Wednesday 2026-01-07 15:59:30 UTC.
+    clock = [1767801570.0]
+    monkeypatch.setattr(engine.time, "time", lambda: clock[0])
+    monkeypatch.setattr(engine, "_market_open_cache", None)
+    assert engine.us_market_is_open("UTC") is True
+    assert engine._market_open_cache == ("UTC", int(clock[0] // 60), True)
+    assert engine.us_market_is_open("UTC") is True
+    clock[0] += 60.0
+    assert engine.us_market_is_open("UTC") is False
+    assert engine.us_market_is_open("America/New_York") is True
+
+
+def test_engine_events_below_log_level_are_not_stored(monkeypatch, capsys, tmp_path) -> None:
+    path = tmp_path / "engine_log_level.yaml"
+    path.write_text(_yaml_for_strategy() + "log_level: INFO\n", encoding="utf-8")
+    config = load_config(path)
+    monkeypatch.delenv("AUTOSTOCK_LOG_LEVEL", raising=False)
+    assert _engine_log_level(config) == 20
+    monkeypatch.setenv("AUTOSTOCK_LOG_LEVEL", "debug")
+    assert _engine_log_level(config) == 10
+
+    db = Database(":memory:")
+    ctx = EngineContext(config=config, db=db, broker=None, risk=None, min_log_level=20)
+    try:
+        _mark_event(ctx, "DEBUG", "quiet")
+        _mark_event(ctx, "INFO", "loud")
+        assert [row["message"] for row in db.events_since("1970-01-01")] == ["loud"]
+        assert "quiet" not in capsys.readouterr().out
+    finally:
+        db.close()
+
+
+class _LockProbeBroker:
+    def __init__(self, db_path: str) -> None:
+        self.db_path = db_path
+        self.other_writer_ok: list[bool] = []
+
+    def submit_market_order(self, symbol: str, side: str, quantity: int) -> str:
+        other = sqlite3.connect(self.db_path, timeout=0)
+        try:
+            other.execute("INSERT INTO events (ts_utc, level, message) VALUES ('x', 'INFO', 'sidecar')")
+            other.commit()
+            self.other_writer_ok.append(True)
+        except sqlite3.OperationalError:
+            self.other_writer_ok.append(False)
+        finally:
+            other.close()
+        return "Filled"
+
+
+def test_execute_symbol_releases_write_lock_before_submitting_orders(tmp_path) -> None:
+    path = tmp_path / "lock_probe.yaml"
+    path.write_text(_yaml_for_strategy(), encoding="utf-8")
+    config = load_config(path)
+    db_path = str(tmp_path / "lock_probe.db")
+    db = Database(db_path)
+    broker = _LockProbeBroker(db_path)
+    ctx = EngineContext(config=config, db=db, broker=broker, risk=RiskManager(config.risk))
+    try:
+        positions = {"MSFT": PositionInfo(symbol="MSFT", quantity=10.0, avg_cost=100.0)}
+        _execute_symbol(ctx, "MSFT", 10_000.0, positions, [50.0])
+        assert broker.other_writer_ok == [True]
+        assert [row["signal"] for row in db.conn.execute("SELECT signal FROM orders")] == ["STOP_LOSS"]
+    finally:
+        db.close()
+
+
+class _FakeFeedBroker:
+    def __init__(self) -> None:
+        self.bulk_calls: list[list[tuple[str, str, str]]] = []
+
+    def get_historical_bars_bulk(self, requests, max_concurrency=4, errors=None):
+        requests = list(requests)
+        self.bulk_calls.append(requests)
+        bars = [HistoricalBar("2026-01-07 10:00:00", 1.0, 1.0, 1.0, 101.5, 10.0)]
+        for request in requests:
+            if request[0] == "FEEDPOLLC" and errors is not None:
+                errors[request] = RuntimeError("pacing violation")
+        return {request: (bars if request[0] == "FEEDPOLLA" else []) for request in requests}
+
+
+def test_market_data_feed_fetches_all_symbols_in_one_batch(monkeypatch, capsys, tmp_path) -> None:
+    path = tmp_path / "engine_feed_batch.yaml"
+    path.write_text(_yaml_for_strategy(), encoding="utf-8")
+    config = load_config(path)
+    monkeypatch.chdir(tmp_path)
+    feed = MarketDataFeed(config, ["FEEDPOLLA", "FEEDPOLLB", "FEEDPOLLC"], config.ib)
+    broker = _FakeFeedBroker()
+    feed._poll_once(broker)
+    assert broker.bulk_calls == [
+        [("FEEDPOLLA", "60 D", "10 mins"), ("FEEDPOLLB", "60 D", "10 mins"), ("FEEDPOLLC", "60 D", "10 mins")]
+    ]
+    warnings = [line for line in capsys.readouterr().out.splitlines() if line.startswith("[WARN]")]
+    assert len(warnings) == 1
+    assert warnings[0].endswith("market data feed error: FEEDPOLLC: pacing violation")
+    assert feed.next_symbol(0.01) == "FEEDPOLLA"
+    assert feed.next_symbol(0.01) is None
+    assert feed.get_latest("FEEDPOLLA").closes == [101.5]
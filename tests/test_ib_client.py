@@ -1,14 +1,27 @@
-import pytest
-
-from autostock.ib_client import build_market_order, choose_account, close_order_for_position
+import asyncio
+import time
+from datetime import datetime, timezone
 
+import pytest
+from ib_insync import CommissionReport, Event, Execution, Fill, OrderStatus, Position, Stock, Trade
 
-def test_choose_account_uses_first_when_preferred_empty() -> None:
-    assert choose_account("", ["DU111", "DU222"]) == "DU111"
+from autostock.config import IBConfig
+from autostock.ib_client import (
+    IBClient,
+    build_market_order,
+    choose_account,
+    close_order_for_position,
+    usable_ticker_price,
+)
 
 
-def test_choose_account_uses_preferred_when_present() -> None:
-    assert choose_account("DU222", ["DU111", "DU222"]) == "DU222"
+@pytest.mark.parametrize(
+    ("preferred", "expected"),
+    [("", "DU111"), ("DU222", "DU222")],
+    ids=["uses_first_when_preferred_empty", "uses_preferred_when_present"],
+)
+def test_choose_account(preferred: str, expected: str) -> None:
+    assert choose_account(preferred, ["DU111", "DU222"]) == expected
 
 
 def test_choose_account_raises_when_preferred_not_available() -> None:
@@ -16,16 +29,13 @@ def test_choose_account_raises_when_preferred_not_available() -> None:
         choose_account("DU999", ["DU111", "DU222"])
 
 
-def test_close_order_for_position_long_closes_with_sell() -> None:
-    side, qty = close_order_for_position(12.0)
-    assert side == "SELL"
-    assert qty == 12
-
-
-def test_close_order_for_position_short_closes_with_buy() -> None:
-    side, qty = close_order_for_position(-7.0)
-    assert side == "BUY"
-    assert qty == 7
+@pytest.mark.parametrize(
+    ("quantity", "expected"),
+    [(12.0, ("SELL", 12)), (-7.0, ("BUY", 7))],
+    ids=["long_closes_with_sell", "short_closes_with_buy"],
+)
+def test_close_order_for_position(quantity: float, expected: tuple[str, int]) -> None:
+    assert close_order_for_position(quantity) == expected
 
 
 def test_close_order_for_position_zero_raises() -> None:
@@ -44,3 +54,139 @@ def test_build_market_order_sets_day_and_rth_defaults() -> None:
 def test_build_market_order_rejects_non_positive_quantity() -> None:
     with pytest.raises(ValueError):
         build_market_order("SELL", 0)
+
+
+class _FakeTicker:
+    def __init__(self, market: float = float("nan"), last: float = float("nan"), close: float = float("nan")):
+        self.market = market
+        self.last = last
+        self.close = close
+
+    def marketPrice(self) -> float:
+        return self.market
+
+
+def test_usable_ticker_price_falls_back_to_last_then_close() -> None:
+    assert usable_ticker_price(_FakeTicker(market=10.5, last=10.0)) == 10.5
+    assert usable_ticker_price(_FakeTicker(last=10.0, close=9.0)) == 10.0
+    assert usable_ticker_price(_FakeTicker(close=9.0)) == 9.0
+    assert usable_ticker_price(_FakeTicker()) is None
+
+
+class _FakeQuoteIB:
+    def __init__(self) -> None:
+        self.pendingTickersEvent = Event("pendingTickersEvent")
+        self.qualify_calls = 0
+        self.tickers: dict[str, _FakeTicker] = {}
+        self.cancelled: list[str] = []
+
+    def run(self, awaitable):
+        return asyncio.run(awaitable)
+
+    def qualifyContracts(self, *contracts):
+        self.qualify_calls += 1
+        for contract in contracts:
+            contract.conId = len(contract.symbol)
+        return list(contracts)
+
+    def reqMktData(self, contract, *args):
+        ticker = _FakeTicker()
+        self.tickers[contract.symbol] = ticker
+        if contract.symbol == "AAA":
+            ticker.last = 12.0
+
+        def _quote_bbb() -> None:
+            self.tickers["BBB"].market = 34.0
+            self.pendingTickersEvent.emit(set())
+
+        if contract.symbol == "BBB":
+            asyncio.get_running_loop().call_later(0.01, _quote_bbb)
+        return ticker
+
+    def cancelMktData(self, contract) -> None:
+        self.cancelled.append(contract.symbol)
+
+
+def test_get_last_prices_requests_all_symbols_together() -> None:
+    client = IBClient(IBConfig("127.0.0.1", 7497, 1, "", "paper"))
+    client.ib = _FakeQuoteIB()
+    prices = client.get_last_prices(["AAA", "BBB", "CCC", "AAA"], timeout=0.2)
+    assert prices == {"AAA": 12.0, "BBB": 34.0}
+    assert client.ib.qualify_calls == 1
+    assert client.ib.cancelled == ["AAA", "BBB", "CCC"]
+    client.get_last_prices(["BBB"], timeout=0.05)
+    assert client.ib.qualify_calls == 1
+
+
+class _FakeExecutionsIB:
+    def __init__(self, fills) -> None:
+        self.fills = fills
+
+    def reqExecutions(self, filter_):
+        return self.fills
+
+
+def test_get_executions_since_converts_fills() -> None:
+    fill_time = datetime(2026, 1, 7, 15, 0, tzinfo=timezone.utc)
+    execution = Execution(
+        execId="0001",
+        time=fill_time.replace(tzinfo=None),
+        acctNumber="DU111",
+        side="bot",
+        shares=10.0,
+        price=101.25,
+        orderId=7,
+        permId=99,
+    )
+    client = IBClient(IBConfig("127.0.0.1", 7497, 1, "", "paper"))
+    client.account = "DU111"
+    client.ib = _FakeExecutionsIB([Fill(Stock("MSFT", "SMART", "USD"), execution, CommissionReport(), fill_time)])
+    (info,) = client.get_executions_since()
+    assert info.exec_id == "0001"
+    assert info.ts_utc == "2026-01-07T15:00:00+00:00"
+    assert (info.account, info.symbol, info.side) == ("DU111", "MSFT", "BOT")
+    assert (info.quantity, info.price, info.order_id, info.perm_id) == (10.0, 101.25, 7, 99)
+
+
+def test_get_positions_reads_only_the_active_account() -> None:
+    client = IBClient(IBConfig("127.0.0.1", 7497, 1, "", "paper"))
+    client.account = "DU111"
+    client.ib.wrapper.positions["DU111"][1] = Position("DU111", Stock("MSFT", "SMART", "USD"), 5.0, 100.0)
+    client.ib.wrapper.positions["DU222"][2] = Position("DU222", Stock("AAPL", "SMART", "USD"), 3.0, 200.0)
+    positions = client.get_positions()
+    assert list(positions) == ["MSFT"]
+    assert (positions["MSFT"].quantity, positions["MSFT"].avg_cost) == (5.0, 100.0)
+
+
+class _FakeOrderIB:
+    def __init__(self) -> None:
+        self.loop = asyncio.new_event_loop()
+
+    def run(self, awaitable):
+        return self.loop.run_until_complete(awaitable)
+
+    def qualifyContracts(self, *contracts):
+        for contract in contracts:
+            contract.conId = 1
+        return list(contracts)
+
+    def placeOrder(self, contract, order):
+        trade = Trade(contract, order, OrderStatus(status="PendingSubmit"))
+
+        def _ack() -> None:
+            trade.orderStatus.status = "Submitted"
+            trade.statusEvent.emit(trade)
+
+        self.loop.call_later(0.01, _ack)
+        return trade
+
+
+def test_submit_market_order_returns_once_tws_acknowledges() -> None:
+    client = IBClient(IBConfig("127.0.0.1", 7497, 1, "", "paper"))
+    client.ib = _FakeOrderIB()
+    try:
+        started = time.perf_counter()
+        assert client.submit_market_order("MSFT", "BUY", 5) == "Submitted"
+        assert time.perf_counter() - started < 0.5
+    finally:
+        client.ib.loop.close()
@@ -0,0 +1,34 @@
+from __future__ import annotations
+
+from autostock.database import Database
+from autostock.reporting import render_daily_report
+
+
+def test_render_daily_report_counts_sides_and_cash_pnl() -> None:
+    db = Database(":memory:")
+    try:
+        db.record_order("MSFT", "BUY", 10, "BUY", "Filled", price=100.0)
+        db.record_order("MSFT", "SELL", 10, "SELL", "Filled", price=103.5)
+        db.record_order("AAPL", "BUY", 5, "BUY", "Submitted")
+        db.log_event("INFO", "loop done")
+        report = render_daily_report(db)
+    finally:
+        db.close()
+    lines = report.splitlines()
+    assert lines[1:4] == ["Orders: 3", "BUY=2, SELL=1", "Approx cash PnL (fills basis): 35.00"]
+    assert lines[4:6] == ["Top cash PnL by symbol:", "- MSFT: 35.00"]
+    assert lines[6] == "Events: 1"
+    assert lines[7].endswith("loop done")
+
+
+def test_render_daily_report_lists_only_latest_ten_events() -> None:
+    db = Database(":memory:")
+    try:
+        for i in range(12):
+            db.log_event("INFO", f"event {i}")
+        lines = render_daily_report(db).splitlines()
+    finally:
+        db.close()
+    assert lines[1:4] == ["Orders: 0", "BUY=0, SELL=0", "Approx cash PnL (fills basis): 0.00"]
+    assert lines[4] == "Events: 12"
+    assert len(lines) == 15
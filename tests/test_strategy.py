@@ -1,8 +1,14 @@
+import numpy as np
+import pytest
+
 from autostock.config import RSIConfig, StrategyComboConfig, StrategyConfig
 from autostock.strategy import (
     Signal,
+    StrategyVote,
+    combine_votes,
     evaluate_combined_signal,
     evaluate_combined_signal_at,
+    evaluate_combined_signal_series,
     moving_average_crossover_signal,
     rsi_signal,
     simple_moving_average,
@@ -12,6 +18,8 @@ from autostock.strategy import (
 def test_simple_moving_average_basic() -> None:
     values = [1.0, 2.0, 3.0, 4.0]
     assert simple_moving_average(values, 2) == [1.5, 2.5, 3.5]
+    assert simple_moving_average(np.array(values), 3) == [2.0, 3.0]
+    assert simple_moving_average(values, 5) == []
 
 
 def test_moving_average_crossover_buy_signal() -> None:
@@ -66,3 +74,89 @@ def test_evaluate_combined_signal_at_matches_slice_based_evaluation() -> None:
         signal_slice, detail_slice = evaluate_combined_signal(closes[: i + 1], strategy_cfg, combo_cfg)
         assert signal_at == signal_slice
         assert detail_at == detail_slice
+
+
+def test_evaluate_combined_signal_series_matches_per_index_evaluation() -> None:
+    closes = [100.0, 101.0, 99.0, 102.0, 104.0, 103.0, 105.0, 107.0, 106.0, 108.0, 104.0, 101.0, 101.0, 103.0]
+    strategy_cfg = StrategyConfig(short_window=2, long_window=4, bar_size="5 mins", duration="60 D", loop_interval_seconds=60)
+    combo_cfg = StrategyComboConfig(
+        enabled_strategies=["ma", "rsi"],
+        combination_mode="weighted",
+        decision_threshold=0.2,
+        weights={"ma": 1.0, "rsi": 0.6},
+        rsi=RSIConfig(window=3, oversold=35.0, overbought=65.0),
+    )
+    codes = {Signal.BUY: 1, Signal.SELL: -1, Signal.HOLD: 0}
+
+    series = evaluate_combined_signal_series(closes, strategy_cfg, combo_cfg)
+    assert len(series) == len(closes)
+    for i in range(len(closes)):
+        signal_at, _detail = evaluate_combined_signal_at(closes, i, strategy_cfg, combo_cfg)
+        assert series[i] == codes[signal_at]
+
+
+@pytest.mark.parametrize("mode", ["priority", "unanimous", "vote", "weighted"])
+def test_evaluate_combined_signal_series_matches_for_every_combination_mode(mode: str) -> None:
+    closes = [
+        100.0, 97.0, 95.0, 99.0, 101.0, 98.0, 97.0, 101.0, 98.0, 102.0,
+        106.0, 105.0, 106.0, 108.0, 111.0, 107.0, 104.0, 100.0, 99.0, 103.0,
+    ]
+    strategy_cfg = StrategyConfig(short_window=2, long_window=5, bar_size="5 mins", duration="60 D", loop_interval_seconds=60)
+    combo_cfg = StrategyComboConfig(
+        enabled_strategies=["ma", "rsi"],
+        combination_mode=mode,
+        decision_threshold=0.3,
+        weights={"ma": 1.0, "rsi": 0.8},
+        rsi=RSIConfig(window=4, oversold=40.0, overbought=60.0),
+    )
+    codes = {Signal.BUY: 1, Signal.SELL: -1, Signal.HOLD: 0}
+
+    series = evaluate_combined_signal_series(closes, strategy_cfg, combo_cfg)
+    for i in range(len(closes)):
+        signal, _detail = evaluate_combined_signal(closes[: i + 1], strategy_cfg, combo_cfg)
+        assert series[i] == codes[signal]
+
+
+def test_evaluate_combined_signal_series_reuses_strategy_series_across_combo_settings() -> None:
+    from autostock import strategy
+
+    closes = [100.0, 97.0, 95.0, 99.0, 101.0, 98.0, 97.0, 101.0, 98.0, 102.0, 106.0, 105.0]
+    strategy_cfg = StrategyConfig(short_window=2, long_window=5, bar_size="5 mins", duration="60 D", loop_interval_seconds=60)
+    rsi_cfg = RSIConfig(window=4, oversold=40.0, overbought=60.0)
+    strategy._cached_ma_series.cache_clear()
+    for mode in ["vote", "weighted"]:
+        combo_cfg = StrategyComboConfig(
+            enabled_strategies=["ma", "rsi"],
+            combination_mode=mode,
+            decision_threshold=0.3,
+            weights={"ma": 1.0, "rsi": 0.8},
+            rsi=rsi_cfg,
+        )
+        series = evaluate_combined_signal_series(closes, strategy_cfg, combo_cfg)
+        assert series.flags.writeable
+    info = strategy._cached_ma_series.cache_info()
+    assert (info.hits, info.misses) == (1, 1)
+    strategy.clear_signal_series_cache()
+    assert strategy._cached_ma_series.cache_info().currsize == 0
+    assert strategy._cached_rsi_series.cache_info().currsize == 0
+
+
+def test_combine_votes_unanimous_and_vote_outcomes() -> None:
+    def decide(mode: str, *signals: Signal) -> tuple[Signal, str]:
+        combo = StrategyComboConfig(
+            enabled_strategies=["ma", "rsi"],
+            combination_mode=mode,
+            decision_threshold=0.0,
+            weights={},
+            rsi=RSIConfig(window=14, oversold=30.0, overbought=70.0),
+        )
+        votes = [StrategyVote(name=f"s{i}", signal=sig, weight=1.0, reason="test") for i, sig in enumerate(signals)]
+        return combine_votes(votes, combo)
+
+    assert decide("unanimous", Signal.BUY, Signal.BUY) == (Signal.BUY, "unanimous:buy")
+    assert decide("unanimous", Signal.SELL, Signal.SELL) == (Signal.SELL, "unanimous:sell")
+    assert decide("unanimous", Signal.HOLD, Signal.HOLD) == (Signal.HOLD, "unanimous:all_hold")
+    assert decide("unanimous", Signal.BUY, Signal.HOLD) == (Signal.HOLD, "unanimous:conflict")
+    assert decide("unanimous", Signal.BUY, Signal.SELL) == (Signal.HOLD, "unanimous:conflict")
+    assert decide("vote", Signal.BUY, Signal.BUY, Signal.SELL) == (Signal.BUY, "vote:2-1")
+    assert decide("vote", Signal.BUY, Signal.SELL, Signal.HOLD) == (Signal.HOLD, "vote:tied:1-1")